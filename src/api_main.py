@@ -1,93 +1,321 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
 import tempfile
-from pathlib import Path
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
-from fastapi import FastAPI, File, HTTPException, UploadFile, Body
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile, Body
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 
 from src.models.resume import Resume
 from src.models.ats_score import ATSScore
-from src.models.insights import SalaryRecommendation, UpskillingReport
+from src.models.insights import InsightsBundle, SalaryRecommendation, UpskillingReport
 from src.services.gemini_client import GeminiClient
 from src.services.ats_scorer import ATSScorer
 from src.services.insights_service import InsightsService
-from src.storage.resume_store import save_parsed_resume
+from src.services.single_flight import SingleFlight
+from src.storage.resume_store import (
+    find_by_content_hash,
+    hash_job_description,
+    load_parsed_resume,
+    save_parsed_resume,
+)
 
 
 app = FastAPI(title="Resume Structuring Service")
 
+# Maximum number of resume extractions sent to Gemini concurrently per process.
+MAX_CONCURRENCY = int(os.getenv("RESUME_CONCURRENCY", "8"))
+_EXTRACTION_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENCY)
+
+# Maximum number of new resumes extracted in a single Gemini request.
+RESUME_BATCH_SIZE = max(1, int(os.getenv("RESUME_BATCH_SIZE", "4")))
+
+# Size of each read when hashing an upload (1 MiB).
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+_ALLOWED_CONTENT_TYPES: frozenset[str] = frozenset({
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain",
+})
+
+# Coalesce duplicate in-flight requests so concurrent identical calls hit Gemini once.
+_ats_flights: SingleFlight[ATSScore] = SingleFlight()
+_salary_flights: SingleFlight[SalaryRecommendation] = SingleFlight()
+_upskilling_flights: SingleFlight[UpskillingReport] = SingleFlight()
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client() -> GeminiClient:
+    """Return the process-wide Gemini client, creating it on first use."""
+    return GeminiClient()
+
+
+@lru_cache(maxsize=1)
+def get_ats_scorer() -> ATSScorer:
+    """Return the process-wide ATS scorer sharing the Gemini client."""
+    return ATSScorer(gemini_client=get_gemini_client())
+
+
+@lru_cache(maxsize=1)
+def get_insights_service() -> InsightsService:
+    """Return the process-wide insights service."""
+    return InsightsService()
+
+
+class _StagedUpload(NamedTuple):
+    """A validated, hashed upload waiting for extraction."""
+
+    filename: Optional[str]
+    stream: BinaryIO
+    mime_type: str
+    content_hash: str
+
+
+def _upload_stream(file: UploadFile) -> BinaryIO:
+    """Return the ``io.IOBase`` file holding an upload's bytes.
+
+    ``SpooledTemporaryFile`` only subclasses ``io.IOBase`` from Python 3.11,
+    and both ``GeminiClient._upload`` and google-genai's ``files.upload``
+    check for it, so the file behind the spool (a ``BytesIO`` or, once
+    rolled over, a temporary file) is handed to Gemini instead.
+    """
+    spool = file.file
+    if isinstance(spool, tempfile.SpooledTemporaryFile):
+        return spool._file
+    return spool
+
+
+async def _hash_upload(file: UploadFile) -> str:
+    """Return the BLAKE2b digest of an upload's bytes, read in chunks.
+
+    The upload is rewound afterwards so its spooled file can be handed to
+    Gemini directly; it is never copied to a second file or held in memory.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        hasher.update(chunk)
+    await file.seek(0)
+    return hasher.hexdigest()
+
+
+def _upload_error(filename: Optional[str], exc: BaseException) -> Dict[str, Any]:
+    return {
+        "filename": filename,
+        "status": "error",
+        "detail": f"Failed to process resume: {exc}",
+    }
+
+
+def _stream_snapshots(make_iterator: Callable[[], Iterator[BaseModel]]) -> StreamingResponse:
+    """Stream the snapshots of a blocking model generator as NDJSON lines.
+
+    Each line is one (possibly partial) snapshot; the last line is the final
+    validated result. The status line has already been sent by the time a
+    mid-stream failure happens, so it is reported as a final
+    ``{"status": "error", "detail": ...}`` line instead.
+
+    The generator is advanced and closed by a single worker thread feeding a
+    queue. When the client disconnects, the thread is told to stop and closes
+    the generator after its current step, never while it is executing.
+    """
+    async def _ndjson() -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        stop = threading.Event()
+
+        def _put(line: Optional[bytes]) -> None:
+            try:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            except RuntimeError:
+                pass  # Event loop already closed (shutdown)
+
+        def _pump() -> None:
+            iterator = make_iterator()
+            try:
+                for snapshot in iterator:
+                    if stop.is_set():
+                        break
+                    _put(orjson.dumps(snapshot.model_dump(mode="json", warnings=False)) + b"\n")
+            except Exception as exc:  # noqa: BLE001
+                _put(orjson.dumps({"status": "error", "detail": str(exc)}) + b"\n")
+            finally:
+                iterator.close()
+                _put(None)
+
+        loop.run_in_executor(None, _pump)
+        try:
+            while (line := await lines.get()) is not None:
+                yield line
+        finally:
+            stop.set()
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
 
 @app.post("/resumes")
-async def upload_resumes(files: List[UploadFile] = File(...)):
+async def upload_resumes(
+    files: List[UploadFile] = File(...),
+    stream: bool = Query(
+        default=False,
+        description="If True, stream one NDJSON line per file as soon as it finishes.",
+    ),
+):
     """Upload one or more resume files and store structured JSON outputs.
 
     Accepts PDF, DOCX, and TXT files. Each file is sent to Gemini API for
     structured extraction and the resulting JSON is stored on disk.
 
-    Returns a list of results with per-file status and ID.
+    New files are grouped into batches of up to ``RESUME_BATCH_SIZE`` per
+    Gemini request, and batches run concurrently (bounded by
+    ``RESUME_CONCURRENCY``). Returns a list of results with per-file status
+    and ID, in upload order. With ``stream=true`` the response is NDJSON
+    instead: one result per line in completion order, each carrying the
+    ``index`` of the file in the upload.
     """
 
-    allowed_content_types = {
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "text/plain",
-    }
-
     try:
-        client = GeminiClient()
+        client = get_gemini_client()
     except RuntimeError as exc:  # missing API key
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    results = []
-
-    for file in files:
-        if file.content_type not in allowed_content_types:
-            results.append(
-                {
-                    "filename": file.filename,
-                    "status": "error",
-                    "detail": "Unsupported file type. Please upload pdf, docx, or txt.",
-                }
-            )
-            continue
+    async def _stage(file: UploadFile) -> Union[Dict[str, Any], _StagedUpload]:
+        """Validate and hash an upload, or return its final result if no extraction is needed."""
+        if file.content_type not in _ALLOWED_CONTENT_TYPES:
+            return {
+                "filename": file.filename,
+                "status": "error",
+                "detail": "Unsupported file type. Please upload pdf, docx, or txt.",
+            }
 
         try:
-            file_bytes = await file.read()
-            
-            # Determine file extension from original filename
-            suffix = Path(file.filename).suffix or ".tmp"
-            
-            # Write to a temporary file with the correct extension so Gemini can infer MIME type
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                tmp.write(file_bytes)
-                tmp_path = tmp.name
-            
-            try:
-                resume = client.extract_resume(tmp_path, schema=Resume)
-                resume_id = save_parsed_resume(resume)
-                results.append(
-                    {
-                        "filename": file.filename,
-                        "id": resume_id,
-                        "status": "success",
-                    }
+            # Hash the content so identical re-uploads can skip Gemini
+            content_hash = await _hash_upload(file)
+            cached_id = await asyncio.to_thread(find_by_content_hash, content_hash)
+        except Exception as exc:  # noqa: BLE001
+            return _upload_error(file.filename, exc)
+
+        if cached_id:
+            return {
+                "filename": file.filename,
+                "id": cached_id,
+                "status": "success",
+                "cached": True,
+            }
+        # Starlette already spooled the upload; Gemini reads that file
+        # directly, with the MIME type taken from the validated content type.
+        return _StagedUpload(file.filename, _upload_stream(file), file.content_type, content_hash)
+
+    async def _save(staged: _StagedUpload, resume: Resume) -> Dict[str, Any]:
+        try:
+            resume_id = await asyncio.to_thread(save_parsed_resume, resume, staged.content_hash)
+        except Exception as exc:  # noqa: BLE001
+            return _upload_error(staged.filename, exc)
+        return {
+            "filename": staged.filename,
+            "id": resume_id,
+            "status": "success",
+        }
+
+    async def _extract_one(staged: _StagedUpload) -> Dict[str, Any]:
+        try:
+            # The Gemini SDK is synchronous; run it in a worker thread and
+            # bound the number of in-flight extractions (the client itself
+            # takes a rate-limiter permit around the Gemini call).
+            async with _EXTRACTION_SEMAPHORE:
+                resume = await asyncio.to_thread(
+                    client.extract_resume, staged.stream, schema=Resume, mime_type=staged.mime_type
                 )
-            finally:
-                # Clean up temporary file
-                Path(tmp_path).unlink(missing_ok=True)
         except Exception as exc:  # noqa: BLE001
-            results.append(
-                {
-                    "filename": file.filename,
-                    "status": "error",
-                    "detail": f"Failed to process resume: {exc}",
-                }
-            )
+            return _upload_error(staged.filename, exc)
+        return await _save(staged, resume)
+
+    async def _extract_batch(batch: List[_StagedUpload]) -> List[Dict[str, Any]]:
+        if len(batch) == 1:
+            return [await _extract_one(batch[0])]
+        try:
+            async with _EXTRACTION_SEMAPHORE:
+                resumes = await asyncio.to_thread(
+                    client.extract_resumes_batch,
+                    [staged.stream for staged in batch],
+                    schema=Resume,
+                    mime_types=[staged.mime_type for staged in batch],
+                )
+        except Exception:  # noqa: BLE001
+            # Fall back to one request per file so a single bad file
+            # does not fail the whole batch.
+            return list(await asyncio.gather(*(_extract_one(staged) for staged in batch)))
+        return [await _save(staged, resume) for staged, resume in zip(batch, resumes)]
+
+    async def _iter_results() -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Yield ``(upload index, result)`` pairs as files finish processing.
+
+        Staged files are grouped into batches as they arrive, so extraction of
+        the first batch starts while later files are still being hashed.
+        """
+        stage_tasks = {asyncio.ensure_future(_stage(file)): index for index, file in enumerate(files)}
+        batch_tasks: Dict[asyncio.Future, List[Tuple[int, _StagedUpload]]] = {}
+        pending: List[Tuple[int, _StagedUpload]] = []
+
+        def _launch_batch() -> None:
+            batch = pending[:RESUME_BATCH_SIZE]
+            del pending[:RESUME_BATCH_SIZE]
+            task = asyncio.ensure_future(_extract_batch([staged for _, staged in batch]))
+            batch_tasks[task] = batch
 
-    return JSONResponse(results)
+        try:
+            while stage_tasks or batch_tasks or pending:
+                if pending and (len(pending) >= RESUME_BATCH_SIZE or not stage_tasks):
+                    _launch_batch()
+                    continue
+                done, _ = await asyncio.wait(
+                    [*stage_tasks, *batch_tasks], return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task in stage_tasks:
+                        index = stage_tasks.pop(task)
+                        if task.exception() is not None:
+                            # _stage converts failures into error dicts; this only
+                            # guards against anything escaping it.
+                            yield index, _upload_error(files[index].filename, task.exception())
+                        elif isinstance(task.result(), _StagedUpload):
+                            pending.append((index, task.result()))
+                        else:
+                            yield index, task.result()
+                    else:
+                        batch = batch_tasks.pop(task)
+                        for position, (index, staged) in enumerate(batch):
+                            yield index, (
+                                _upload_error(staged.filename, task.exception())
+                                if task.exception() is not None
+                                else task.result()[position]
+                            )
+        finally:
+            # Client went away mid-stream: stop outstanding work
+            for task in [*stage_tasks, *batch_tasks]:
+                task.cancel()
+
+    if stream:
+        async def _ndjson() -> AsyncIterator[bytes]:
+            async for index, result in _iter_results():
+                yield orjson.dumps({"index": index, **result}) + b"\n"
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+    async for index, result in _iter_results():
+        results[index] = result
+
+    # Typed endpoints are serialized by FastAPI via pydantic-core; this plain
+    # list is rendered with orjson directly.
+    return Response(content=orjson.dumps(results), media_type="application/json")
 
 
 class ATSScoreRequest(BaseModel):
@@ -97,6 +325,21 @@ class ATSScoreRequest(BaseModel):
         default=True,
         description="If True, return cached score if available. Set to False to force re-evaluation.",
     )
+    near_duplicates: bool = Field(
+        default=False,
+        description=(
+            "If True, a score cached for a near-duplicate job description may be returned; "
+            "such responses have approximate_match set."
+        ),
+    )
+
+    @field_validator("job_description")
+    @classmethod
+    def validate_job_description(cls, v: str) -> str:
+        """Reject blank job descriptions before any resume or Gemini work."""
+        if not v.strip():
+            raise ValueError("job_description must not be empty")
+        return v
 
 
 class SalaryRecommendationRequest(BaseModel):
@@ -114,6 +357,13 @@ class SalaryRecommendationRequest(BaseModel):
         default=None,
         description="Years of experience (optional, calculated from resume if not provided)"
     )
+    near_duplicates: bool = Field(
+        default=False,
+        description=(
+            "If True and this exact request is not cached, a result cached for a similar "
+            "request may be returned; such responses have approximate_match set."
+        ),
+    )
 
 
 class UpskillingRequest(BaseModel):
@@ -127,8 +377,46 @@ class UpskillingRequest(BaseModel):
         default=None,
         description="Target role for upskilling (optional, uses current role if not provided)"
     )
+    near_duplicates: bool = Field(
+        default=False,
+        description=(
+            "If True and this exact request is not cached, a result cached for a similar "
+            "request may be returned; such responses have approximate_match set."
+        ),
+    )
 
 
+class InsightsRequest(BaseModel):
+    """Request for salary and upskilling insights in one call."""
+    resume_id: str = Field(..., description="UUID of the resume to analyze")
+    job_title: str | None = Field(
+        default=None,
+        description="Target job title for salary research (optional, uses resume's current role if not provided)"
+    )
+    location: str | None = Field(
+        default=None,
+        description="Target location (optional, uses resume's location if not provided)"
+    )
+    experience_years: int | None = Field(
+        default=None,
+        description="Years of experience (optional, calculated from resume if not provided)"
+    )
+    job_description_hash: str | None = Field(
+        default=None,
+        description="Hash of job description for ATS score lookup (optional)"
+    )
+    target_role: str | None = Field(
+        default=None,
+        description="Target role for upskilling (optional, uses current role if not provided)"
+    )
+    near_duplicates: bool = Field(
+        default=False,
+        description=(
+            "If True and this exact request is not cached, a result cached for a similar "
+            "request may be returned; such responses have approximate_match set."
+        ),
+    )
+
 
 @app.post("/ats-score", response_model=ATSScore)
 async def score_resume_ats(request: ATSScoreRequest = Body(...)):
@@ -137,13 +425,15 @@ async def score_resume_ats(request: ATSScoreRequest = Body(...)):
     Accepts a resume ID (from previously uploaded resume) and a job description.
     Returns a comprehensive ATS compatibility score with detailed feedback.
     
-    Results are cached in the resume JSON file. Subsequent requests with the same
+    Results are cached in the resume store. Subsequent requests with the same
     resume_id and job_description will return the cached score unless use_cache=False.
+    With near_duplicates=True, a score cached for a near-identical job description
+    may be returned instead, flagged by approximate_match.
 
     Parameters
     ----------
     request: ATSScoreRequest
-        Body containing resume_id, job_description, and optional use_cache flag.
+        Body containing resume_id, job_description, and optional use_cache and near_duplicates flags.
 
     Returns
     -------
@@ -152,13 +442,27 @@ async def score_resume_ats(request: ATSScoreRequest = Body(...)):
         strengths, gaps, recommendations, and keyword analysis.
     """
     try:
-        scorer = ATSScorer()
-        ats_result = scorer.score(
-            resume_id=request.resume_id,
-            job_description=request.job_description,
-            use_cache=request.use_cache,
+        scorer = get_ats_scorer()
+
+        async def _score() -> ATSScore:
+            # Scoring does blocking disk and Gemini I/O; keep it off the event loop
+            return await asyncio.to_thread(
+                scorer.score,
+                resume_id=request.resume_id,
+                job_description=request.job_description,
+                use_cache=request.use_cache,
+                near_duplicates=request.near_duplicates,
+            )
+
+        # Identical concurrent requests share one scoring run; a use_cache=False
+        # request must not be answered by a concurrent cached lookup
+        key = (
+            request.resume_id,
+            hash_job_description(request.job_description),
+            request.use_cache,
+            request.near_duplicates,
         )
-        return ats_result
+        return await _ats_flights.run(key, _score)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=404,
@@ -172,7 +476,13 @@ async def score_resume_ats(request: ATSScoreRequest = Body(...)):
 
 
 @app.post("/insights/salary-recommendation", response_model=SalaryRecommendation)
-async def get_salary_recommendation(request: SalaryRecommendationRequest = Body(...)):
+async def get_salary_recommendation(
+    request: SalaryRecommendationRequest = Body(...),
+    stream: bool = Query(
+        default=False,
+        description="If True, respond with NDJSON (one line with the complete recommendation).",
+    ),
+):
     """Generate salary recommendation based on market research.
     
     Uses Gemini AI to analyze market compensation data and provide
@@ -181,7 +491,11 @@ async def get_salary_recommendation(request: SalaryRecommendationRequest = Body(
     Parameters
     ----------
     request: SalaryRecommendationRequest
-        Resume ID, optional job title, location, and experience years.
+        Resume ID, optional job title, location, and experience years, and the
+        near_duplicates flag.
+    stream: bool
+        If True, respond with NDJSON. The research agent produces its answer
+        in one step, so this is a single line with the complete recommendation.
     
     Returns
     -------
@@ -189,14 +503,40 @@ async def get_salary_recommendation(request: SalaryRecommendationRequest = Body(
         Comprehensive salary analysis with market data and trends.
     """
     try:
-        insights = InsightsService()
-        result = insights.get_salary_recommendation(
-            resume_id=request.resume_id,
-            job_title=request.job_title,
-            location=request.location,
-            experience_years=request.experience_years
+        insights = get_insights_service()
+
+        if stream:
+            # Load up front so a missing resume is still a 404
+            resume_data = await asyncio.to_thread(load_parsed_resume, request.resume_id)
+            return _stream_snapshots(
+                lambda: insights.stream_salary_recommendation(
+                    resume_id=request.resume_id,
+                    job_title=request.job_title,
+                    location=request.location,
+                    experience_years=request.experience_years,
+                    resume_data=resume_data,
+                    near_duplicates=request.near_duplicates,
+                )
+            )
+
+        async def _recommend() -> SalaryRecommendation:
+            return await asyncio.to_thread(
+                insights.get_salary_recommendation,
+                resume_id=request.resume_id,
+                job_title=request.job_title,
+                location=request.location,
+                experience_years=request.experience_years,
+                near_duplicates=request.near_duplicates,
+            )
+
+        key = (
+            request.resume_id,
+            request.job_title,
+            request.location,
+            request.experience_years,
+            request.near_duplicates,
         )
-        return result
+        return await _salary_flights.run(key, _recommend)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=404,
@@ -217,7 +557,13 @@ async def get_salary_recommendation(request: SalaryRecommendationRequest = Body(
 
 
 @app.post("/insights/upskilling-resources", response_model=UpskillingReport)
-async def get_upskilling_resources(request: UpskillingRequest = Body(...)):
+async def get_upskilling_resources(
+    request: UpskillingRequest = Body(...),
+    stream: bool = Query(
+        default=False,
+        description="If True, stream NDJSON snapshots of the report as fields are generated.",
+    ),
+):
     """Generate upskilling recommendations and learning path.
     
     Uses Gemini AI to identify skill gaps, find learning resources,
@@ -226,7 +572,11 @@ async def get_upskilling_resources(request: UpskillingRequest = Body(...)):
     Parameters
     ----------
     request: UpskillingRequest
-        Resume ID, optional job description hash, and target role.
+        Resume ID, optional job description hash and target role, and the
+        near_duplicates flag.
+    stream: bool
+        If True, respond with NDJSON: partial snapshots as the report is
+        generated, the last line being the complete report.
     
     Returns
     -------
@@ -234,13 +584,37 @@ async def get_upskilling_resources(request: UpskillingRequest = Body(...)):
         Detailed skill gap analysis with learning resources and project recommendations.
     """
     try:
-        insights = InsightsService()
-        result = insights.get_upskilling_recommendations(
-            resume_id=request.resume_id,
-            job_description_hash=request.job_description_hash,
-            target_role=request.target_role
+        insights = get_insights_service()
+
+        if stream:
+            # Load up front so a missing resume is still a 404
+            resume_data = await asyncio.to_thread(load_parsed_resume, request.resume_id)
+            return _stream_snapshots(
+                lambda: insights.stream_upskilling_recommendations(
+                    resume_id=request.resume_id,
+                    job_description_hash=request.job_description_hash,
+                    target_role=request.target_role,
+                    resume_data=resume_data,
+                    near_duplicates=request.near_duplicates,
+                )
+            )
+
+        async def _recommend() -> UpskillingReport:
+            return await asyncio.to_thread(
+                insights.get_upskilling_recommendations,
+                resume_id=request.resume_id,
+                job_description_hash=request.job_description_hash,
+                target_role=request.target_role,
+                near_duplicates=request.near_duplicates,
+            )
+
+        key = (
+            request.resume_id,
+            request.job_description_hash,
+            request.target_role,
+            request.near_duplicates,
         )
-        return result
+        return await _upskilling_flights.run(key, _recommend)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=404,
@@ -260,5 +634,49 @@ async def get_upskilling_resources(request: UpskillingRequest = Body(...)):
         ) from exc
 
 
-
-
+@app.post("/insights/all", response_model=InsightsBundle)
+async def get_all_insights(request: InsightsRequest = Body(...)):
+    """Generate salary and upskilling insights together.
+    
+    The resume is loaded once and both insights are generated concurrently,
+    so the response takes about as long as the slower of the two.
+    
+    Parameters
+    ----------
+    request: InsightsRequest
+        Resume ID plus the optional salary and upskilling parameters.
+    
+    Returns
+    -------
+    InsightsBundle
+        Salary recommendation and upskilling report.
+    """
+    try:
+        insights = get_insights_service()
+        salary, upskilling = await insights.get_all_insights(
+            resume_id=request.resume_id,
+            job_title=request.job_title,
+            location=request.location,
+            experience_years=request.experience_years,
+            job_description_hash=request.job_description_hash,
+            target_role=request.target_role,
+            near_duplicates=request.near_duplicates,
+        )
+        return InsightsBundle(salary_recommendation=salary, upskilling_report=upskilling)
+    except FileNotFoundError as exc:
+        raise HTTPException(
+            status_code=404,
+            detail=str(exc)
+        ) from exc
+    except RuntimeError as exc:
+        # RuntimeError from insights service indicates processing failure
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate insights: {exc}"
+        ) from exc
+    except Exception as exc:
+        # Unexpected errors - log and return generic 500
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error while generating insights"
+        ) from exc
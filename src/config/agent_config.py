@@ -3,6 +3,9 @@ Configuration for deep agent prompts and settings.
 Optimized for speed and accuracy with structured outputs.
 """
 
+from itertools import islice
+from typing import Iterable
+
 # Salary Research Agent Configuration
 SALARY_AGENT_CONFIG = {
     "model": "gemini-2.0-flash-exp",
@@ -10,6 +13,7 @@ SALARY_AGENT_CONFIG = {
     "max_tokens": 4096,
     "timeout": 90,  # 90 seconds for research
     "max_search_results": 8,
+    "domain_search_timeout": 20,  # Seconds per parallel per-domain Tavily query
 }
 
 # Salary search priority domains
@@ -17,11 +21,10 @@ SALARY_SEARCH_DOMAINS = [
     "glassdoor.com",
     "levels.fyi",
     "payscale.com",
-    "linkedin.com/salary",
+    "linkedin.com",
     "salary.com",
-    "indeed.com/career",
+    "indeed.com",
     "bls.gov",
-    "h1bdata.info",
 ]
 
 # System prompt for salary research (optimized for speed)
@@ -36,17 +39,6 @@ SALARY_SYSTEM_PROMPT = """You are a Senior Compensation Analyst specializing in
 4. Identify key factors affecting compensation
 5. Note current market trends
 
-**Output Requirements:**
-Return JSON with:
-- recommended_range: {min_salary, max_salary, currency, period}
-- market_median: median salary value
-- percentile_25: 25th percentile
-- percentile_75: 75th percentile  
-- key_factors: list of 5-7 key factors
-- market_trends: list of 3-5 current trends
-- sources: list of URLs used
-- analysis_summary: 2-3 sentence summary
-
 **Quality Standards:**
 ✓ Use 3+ authoritative sources
 ✓ Specify USD annual unless stated otherwise
@@ -54,10 +46,69 @@ Return JSON with:
 ✓ Include skill premiums (AI/ML, cloud, etc.)
 ✓ Be realistic and data-driven"""
 
+# Research request sent to the salary agent (also the salary cache key input)
+SALARY_RESEARCH_QUERY = """Research salary for:
+Role: {job_title}
+Location: {location}
+Experience: {experience_years} years
+Key Skills: {skills}"""
+
+
+def build_salary_research_query(
+    job_title: str,
+    location: str,
+    experience_years: int,
+    skills: Iterable[str],
+) -> str:
+    """Format SALARY_RESEARCH_QUERY; the agent prompt and the cache key both use this."""
+    return SALARY_RESEARCH_QUERY.format(
+        job_title=job_title,
+        location=location,
+        experience_years=experience_years,
+        skills=", ".join(islice(skills, 6)),
+    )
+
+# System prompt for upskilling reports; the output schema is enforced by
+# structured output, so only the task is described here
+UPSKILLING_SYSTEM_PROMPT = """Analyze skill gaps between the candidate's current and target role and create a learning path.
+
+Provide:
+1. Identified gaps (skills to learn)
+2. Target skills for the target role
+3. Learning resources (15-20 items: videos, docs, courses)
+4. Structured learning path (3-4 phases)
+5. Practice projects (3-5 projects)
+6. Total duration estimate
+7. Expected career impact"""
+
 # Upskilling Agent Configuration
 UPSKILLING_AGENT_CONFIG = {
-    "model": "gemini-2.0-flash-exp",
+    "model": "gemini-2.5-flash",
     "temperature": 0.2,
     "max_tokens": 6144,  # Larger for resource lists
     "timeout": 120,
 }
+
+# Shared Gemini rate limiter (AIMD concurrency + requests-per-minute window)
+GEMINI_RATE_LIMIT_CONFIG = {
+    "max_concurrency": 8,  # Ceiling for concurrent Gemini calls
+    "min_concurrency": 1,
+    "requests_per_minute": 60,
+    "target_latency": 30.0,  # Seconds; slower windows stop growing concurrency
+    "increase": 0.5,  # Additive increase per healthy window
+    "decrease": 0.5,  # Multiplicative decrease on 429/timeout
+}
+
+# Exact-match LLM response cache (keyed by model, prompt, temperature, schema)
+LLM_CACHE_CONFIG = {
+    "ttl_seconds": 7 * 24 * 3600,  # Market data goes stale; re-research weekly
+    "memory_size": 512,  # Most recent entries also kept in process
+}
+
+# Semantic cache for near-duplicate insight requests (embedding similarity)
+SEMANTIC_CACHE_CONFIG = {
+    "embedding_model": "text-embedding-004",
+    "threshold": 0.92,  # Minimum cosine similarity for a hit
+    "ttl_seconds": 7 * 24 * 3600,
+    "max_entries_per_guard": 200,  # Bounds the vectors scanned per lookup
+}
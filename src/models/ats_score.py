@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic.json_schema import SkipJsonSchema
+
+
+# Bump whenever ATSScore/SectionScore fields or constraints change, so cached
+# scores written by an older schema are re-validated instead of trusted.
+ATS_SCORE_SCHEMA_VERSION = 1
 
 
 class SectionScore(BaseModel):
@@ -32,6 +38,19 @@ class SectionScore(BaseModel):
     )
 
 
+class ApproximateMatch(BaseModel):
+    job_description_hash: str = Field(
+        ...,
+        description="Hash of the job description the reused score was computed for.",
+    )
+    similarity: float = Field(
+        ...,
+        ge=0,
+        le=1,
+        description="Estimated Jaccard similarity of the two job descriptions (0-1).",
+    )
+
+
 class ATSScore(BaseModel):
     overall_score: int = Field(
         ...,
@@ -67,3 +86,12 @@ class ATSScore(BaseModel):
         default=None,
         description="Brief summary of the ATS evaluation.",
     )
+    # Set by the scorer, never generated: left out of the schema sent to Gemini
+    approximate_match: SkipJsonSchema[Optional[ApproximateMatch]] = Field(
+        default=None,
+        description="Set when the score was reused from a near-duplicate job description.",
+    )
+
+
+# Prebuilt validator for cached score dicts loaded from storage.
+ATS_SCORE_ADAPTER: TypeAdapter[ATSScore] = TypeAdapter(ATSScore)
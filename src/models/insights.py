@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic.json_schema import SkipJsonSchema
 
 
 class SalaryRange(BaseModel):
@@ -31,6 +32,17 @@ class SalaryRange(BaseModel):
         return self
 
 
+class SemanticMatch(BaseModel):
+    """Marks a result reused from a similar, not identical, earlier request."""
+    
+    similarity: float = Field(
+        ...,
+        ge=0,
+        le=1,
+        description="Cosine similarity of the two requests' embeddings (0-1).",
+    )
+
+
 class SalaryRecommendation(BaseModel):
     """Market-based salary recommendation for a candidate."""
     
@@ -66,6 +78,11 @@ class SalaryRecommendation(BaseModel):
         ...,
         description="Comprehensive summary of salary analysis.",
     )
+    # Set by the service, never generated: left out of the schema sent to Gemini
+    approximate_match: SkipJsonSchema[Optional[SemanticMatch]] = Field(
+        default=None,
+        description="Set when the recommendation was reused from a similar request.",
+    )
 
 
 class LearningResource(BaseModel):
@@ -209,3 +226,21 @@ class UpskillingReport(BaseModel):
         ...,
         description="Executive summary of the upskilling plan.",
     )
+    # Set by the service, never generated: left out of the schema sent to Gemini
+    approximate_match: SkipJsonSchema[Optional[SemanticMatch]] = Field(
+        default=None,
+        description="Set when the report was reused from a similar request.",
+    )
+
+
+class InsightsBundle(BaseModel):
+    """Salary recommendation and upskilling report generated together."""
+    
+    salary_recommendation: SalaryRecommendation = Field(
+        ...,
+        description="Salary analysis for the candidate.",
+    )
+    upskilling_report: UpskillingReport = Field(
+        ...,
+        description="Skill gap analysis and learning path for the candidate.",
+    )
@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from typing import Dict, Any
 
-from src.models.ats_score import ATSScore
+from src.models.ats_score import (
+    ATS_SCORE_ADAPTER,
+    ATS_SCORE_SCHEMA_VERSION,
+    ApproximateMatch,
+    ATSScore,
+    SectionScore,
+)
 from src.services.gemini_client import GeminiClient
 from src.storage.resume_store import (
-    load_parsed_resume,
     get_cached_ats_score,
+    hash_job_description,
+    load_resume_body,
     save_ats_score,
 )
 
@@ -24,7 +31,14 @@ class ATSScorer:
         """
         self.client = gemini_client or GeminiClient()
 
-    def score(self, resume_id: str, job_description: str, use_cache: bool = True) -> ATSScore:
+    def score(
+        self,
+        resume_id: str,
+        job_description: str,
+        use_cache: bool = True,
+        trust_cache: bool = True,
+        near_duplicates: bool = False,
+    ) -> ATSScore:
         """Score a resume against a job description.
 
         Parameters
@@ -35,6 +49,14 @@ class ATSScorer:
             Job description text to evaluate the resume against.
         use_cache: bool
             If True, check for cached score before calling Gemini API.
+        trust_cache: bool
+            If True, cached scores written by the current schema version are
+            rebuilt without Pydantic validation. Set to False to always
+            re-validate cached data.
+        near_duplicates: bool
+            If True, and no score is cached for this exact job description,
+            reuse the score of a near-duplicate one. Such results have
+            ``approximate_match`` set.
 
         Returns
         -------
@@ -46,34 +68,65 @@ class ATSScorer:
         ------
         FileNotFoundError
             If no resume with the given ID exists.
+        ValueError
+            If the job description is empty.
         """
+        if not job_description.strip():
+            raise ValueError("job_description must not be empty")
+
+        # Hash the normalized job description once for both lookup and save
+        job_hash = hash_job_description(job_description)
+
         # Check cache first if enabled
         if use_cache:
-            cached_score = get_cached_ats_score(resume_id, job_description)
+            cached_score = get_cached_ats_score(
+                resume_id, job_description, job_hash=job_hash, near_duplicates=near_duplicates
+            )
             if cached_score:
                 # Return cached score, extracting the actual score data
                 score_data = cached_score.get("score", cached_score)
-                return ATSScore.model_validate(score_data)
+                if trust_cache and cached_score.get("schema_version") == ATS_SCORE_SCHEMA_VERSION:
+                    # Written by this schema after validation; skip re-validating
+                    result = self._construct_cached(score_data)
+                else:
+                    result = ATS_SCORE_ADAPTER.validate_python(score_data)
+                match = cached_score.get("near_duplicate")
+                if match is not None:
+                    result.approximate_match = ApproximateMatch(**match)
+                return result
 
-        # Load the parsed resume data
-        resume_data: Dict[str, Any] = load_parsed_resume(resume_id)
-        
-        # Remove ats_scores from resume_data before sending to Gemini
-        # to avoid sending cached scores in the prompt
-        resume_data_clean = {k: v for k, v in resume_data.items() if k != "ats_scores"}
+        # Load the resume fields only: saved scores and insights stay out of
+        # the prompt, and the body (unlike the merged view) never changes
+        resume_data: Dict[str, Any] = load_resume_body(resume_id)
 
         # Use Gemini to score the resume
         ats_score: ATSScore = self.client.score_resume_ats(
-            resume_data=resume_data_clean,
+            resume_data=resume_data,
             job_description=job_description,
             schema=ATSScore,
+            use_cache=use_cache,
+            resume_id=resume_id,
         )
 
         # Cache the result
         save_ats_score(
             resume_id=resume_id,
             job_description=job_description,
-            ats_score=ats_score.model_dump(mode="json"),
+            ats_score=ats_score.model_dump_json(),
+            job_hash=job_hash,
+            schema_version=ATS_SCORE_SCHEMA_VERSION,
         )
 
         return ats_score
+
+    @staticmethod
+    def _construct_cached(score_data: Dict[str, Any]) -> ATSScore:
+        """Build an ATSScore from trusted cached data without validation."""
+        return ATSScore.model_construct(
+            **{
+                **score_data,
+                "section_scores": SectionScore.model_construct(
+                    **(score_data.get("section_scores") or {})
+                ),
+            }
+        )
@@ -3,13 +3,73 @@ Deep agent implementation for salary market research using Tavily and Gemini.
 Provides structured outputs via Pydantic models and optimized prompts.
 """
 
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
-from tavily import TavilyClient
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import chain, zip_longest
+from typing import AsyncIterator, List, Dict, Any, Iterator, Optional
+from tavily import AsyncTavilyClient, TavilyClient
 from deepagents import create_deep_agent
+from langchain_core.tools import StructuredTool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from src.config.agent_config import (
+    SALARY_AGENT_CONFIG,
+    SALARY_SEARCH_DOMAINS,
+    SALARY_SYSTEM_PROMPT,
+    build_salary_research_query,
+)
 from src.models.insights import SalaryRecommendation
+from src.services.rate_limiter import gemini_limiter
+
+
+def _merge_domain_results(per_domain: List[Dict[str, Any]], max_results: int) -> Dict[str, Any]:
+    """Interleave per-domain Tavily responses into one, deduplicated by URL.
+
+    Results are taken round-robin (each domain's best hit first), so the
+    ``max_results`` budget is spread across domains instead of being used
+    up by whichever domain ranks highest.
+    """
+    merged, seen = [], set()
+    ranked = zip_longest(*(response.get("results", []) for response in per_domain))
+    for result in chain.from_iterable(ranked):
+        if result is None or result.get("url") in seen:
+            continue
+        seen.add(result.get("url"))
+        merged.append(result)
+        if len(merged) >= max_results:
+            break
+    errors = [response["error"] for response in per_domain if "error" in response]
+    response: Dict[str, Any] = {"results": merged}
+    if errors and not merged:
+        response["error"] = "; ".join(errors)
+    return response
+
+
+class _RateLimitedChatModel(ChatGoogleGenerativeAI):
+    """Gemini chat model taking a ``gemini_limiter`` permit for every model call.
+
+    A research run is a tool loop of several model calls; throttling each
+    one keeps the limiter's request rate and latency samples per call
+    rather than per run.
+    """
+
+    def _generate(self, *args: Any, **kwargs: Any) -> Any:
+        with gemini_limiter.permit():
+            return super()._generate(*args, **kwargs)
+
+    async def _agenerate(self, *args: Any, **kwargs: Any) -> Any:
+        async with gemini_limiter.permit():
+            return await super()._agenerate(*args, **kwargs)
+
+    def _stream(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        with gemini_limiter.permit():
+            yield from super()._stream(*args, **kwargs)
+
+    async def _astream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async with gemini_limiter.permit():
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
 
 
 class SalaryResearchAgent:
@@ -31,17 +91,23 @@ class SalaryResearchAgent:
         if not self.tavily_api_key:
             raise RuntimeError("TAVILY_API_KEY not found in environment")
         
-        # Initialize Tavily client
+        # Initialize Tavily clients (sync for invoke, async for ainvoke)
         self.tavily_client = TavilyClient(api_key=self.tavily_api_key)
+        self.async_tavily_client = AsyncTavilyClient(api_key=self.tavily_api_key)
+        # Runs the per-domain searches of the sync tool concurrently
+        self._search_pool = ThreadPoolExecutor(
+            max_workers=len(SALARY_SEARCH_DOMAINS), thread_name_prefix="salary-search"
+        )
         
         # Create search tool
         self._create_search_tool()
         
-        # Initialize Gemini model with structured output
-        self.model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash-exp",
-            temperature=0.2,  # Lower for factual consistency
-            max_tokens=4096,
+        # Initialize Gemini model with structured output; each call it makes
+        # takes its own rate-limiter permit
+        self.model = _RateLimitedChatModel(
+            model=SALARY_AGENT_CONFIG["model"],
+            temperature=SALARY_AGENT_CONFIG["temperature"],
+            max_tokens=SALARY_AGENT_CONFIG["max_tokens"],
             api_key=self.gemini_api_key,
         )
         
@@ -50,10 +116,50 @@ class SalaryResearchAgent:
             model=self.model,
             tools=[self.salary_search],
             system_prompt=self._get_system_prompt(),
+            # Final answer is returned as a SalaryRecommendation directly,
+            # so no second LLM call is needed to structure the research
+            response_format=SalaryRecommendation,
         )
     
     def _create_search_tool(self):
-        """Create specialized salary search tool."""
+        """Create specialized salary search tool.
+        
+        Each call fans out one Tavily query per salary domain, run
+        concurrently and merged, so every domain contributes results and the
+        wall time is that of the slowest domain (capped by
+        ``domain_search_timeout``) rather than one broad query. The tool has a
+        sync and an async implementation: the agent's ``invoke`` uses the
+        first, ``ainvoke`` awaits the second, so async callers never block
+        the event loop on the Tavily round-trips.
+        """
+        timeout = SALARY_AGENT_CONFIG["domain_search_timeout"]
+        search_options = {
+            "topic": "general",
+            "include_raw_content": True,
+        }
+        
+        def _per_domain_limit(max_results: int) -> int:
+            return max(1, -(-max_results // len(SALARY_SEARCH_DOMAINS)))
+        
+        def _search_domain(query: str, domain: str, limit: int) -> Dict[str, Any]:
+            try:
+                return self.tavily_client.search(
+                    query=query, max_results=limit, include_domains=[domain], **search_options
+                )
+            except Exception as e:
+                return {"error": str(e), "results": []}
+        
+        async def _asearch_domain(query: str, domain: str, limit: int) -> Dict[str, Any]:
+            try:
+                return await asyncio.wait_for(
+                    self.async_tavily_client.search(
+                        query=query, max_results=limit, include_domains=[domain], **search_options
+                    ),
+                    timeout,
+                )
+            except Exception as e:
+                return {"error": str(e) or type(e).__name__, "results": []}
+        
         def salary_search(query: str, max_results: int = 8) -> Dict[str, Any]:
             """
             Search salary databases and compensation platforms.
@@ -65,61 +171,45 @@ class SalaryResearchAgent:
             Returns:
                 Search results with salary data
             """
-            # Priority domains for salary data
-            include_domains = [
-                "glassdoor.com",
-                "levels.fyi",
-                "payscale.com",
-                "linkedin.com",
-                "salary.com",
-                "indeed.com",
-                "bls.gov",
+            limit = _per_domain_limit(max_results)
+            futures = [
+                self._search_pool.submit(_search_domain, query, domain, limit)
+                for domain in SALARY_SEARCH_DOMAINS
             ]
-            
-            try:
-                results = self.tavily_client.search(
-                    query=query,
-                    max_results=max_results,
-                    include_domains=include_domains,
-                    topic="general",
-                    include_raw_content=True,
-                )
-                return results
-            except Exception as e:
-                return {"error": str(e), "results": []}
+            # Domains that miss the deadline are left out of this answer
+            wait(futures, timeout=timeout)
+            per_domain = [
+                future.result() if future.done() else {"error": "timed out", "results": []}
+                for future in futures
+            ]
+            return _merge_domain_results(per_domain, max_results)
+        
+        async def asalary_search(query: str, max_results: int = 8) -> Dict[str, Any]:
+            limit = _per_domain_limit(max_results)
+            per_domain = await asyncio.gather(
+                *(_asearch_domain(query, domain, limit) for domain in SALARY_SEARCH_DOMAINS)
+            )
+            return _merge_domain_results(list(per_domain), max_results)
         
-        self.salary_search = salary_search
+        self.salary_search = StructuredTool.from_function(
+            func=salary_search,
+            coroutine=asalary_search,
+            name="salary_search",
+        )
     
     def _get_system_prompt(self) -> str:
-        """Get optimized system prompt for salary research."""
-        return """You are a Senior Compensation Analyst specializing in tech industry salary research.
-
-**Your Task:** Provide data-driven salary recommendations using market research.
-
-**Research Process:**
-1. Search salary databases (Glassdoor, Levels.fyi, Payscale, LinkedIn)
-2. Gather data for role, location, and experience level
-3. Calculate percentiles (25th, median, 75th)
-4. Identify key factors affecting compensation
-5. Note current market trends
-
-**Output Requirements:**
-Return JSON with:
-- recommended_range: {min_salary, max_salary, currency, period}
-- market_median: median salary value
-- percentile_25: 25th percentile
-- percentile_75: 75th percentile  
-- key_factors: list of 5-7 key factors
-- market_trends: list of 3-5 current trends
-- sources: list of URLs used
-- analysis_summary: 2-3 sentence summary
-
-**Quality Standards:**
-✓ Use 3+ authoritative sources
-✓ Specify USD annual unless stated otherwise
-✓ Account for location cost of living
-✓ Include skill premiums (AI/ML, cloud, etc.)
-✓ Be realistic and data-driven"""
+        """Get the shared system prompt for salary research (a static prefix of every request)."""
+        return SALARY_SYSTEM_PROMPT
+    
+    @staticmethod
+    def build_research_query(
+        job_title: str,
+        location: str,
+        experience_years: int,
+        skills: List[str],
+    ) -> str:
+        """Build the research prompt sent to the agent."""
+        return build_salary_research_query(job_title, location, experience_years, skills)
     
     def research_salary(
         self,
@@ -143,14 +233,7 @@ Return JSON with:
         Raises:
             RuntimeError: If research fails
         """
-        # Create concise research query
-        query = f"""Research salary for:
-Role: {job_title}
-Location: {location}
-Experience: {experience_years} years
-Key Skills: {', '.join(skills[:6])}
-
-Provide comprehensive market analysis with salary ranges, percentiles, factors, trends, and sources."""
+        query = self.build_research_query(job_title, location, experience_years, skills)
         
         try:
             # Invoke agent
@@ -158,15 +241,27 @@ Provide comprehensive market analysis with salary ranges, percentiles, factors,
                 "messages": [{"role": "user", "content": query}]
             })
             
-            # Extract response
-            agent_response = result["messages"][-1].content
+            return result["structured_response"]
             
-            # Use Gemini's structured output to parse into Pydantic model
-            structured_response = self.model.with_structured_output(SalaryRecommendation).invoke(
-                f"Parse this salary research into the required format:\n\n{agent_response}"
-            )
+        except Exception as e:
+            raise RuntimeError(f"Salary research failed: {e}")
+    
+    async def aresearch_salary(
+        self,
+        job_title: str,
+        location: str,
+        experience_years: int,
+        skills: List[str],
+    ) -> SalaryRecommendation:
+        """Async variant of :meth:`research_salary` using the agent's ``ainvoke``."""
+        query = self.build_research_query(job_title, location, experience_years, skills)
+        
+        try:
+            result = await self.agent.ainvoke({
+                "messages": [{"role": "user", "content": query}]
+            })
             
-            return structured_response
+            return result["structured_response"]
             
         except Exception as e:
             raise RuntimeError(f"Salary research failed: {e}")
@@ -1,33 +1,133 @@
 from __future__ import annotations
 
-import json
+import io
 import os
+import string
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+import orjson
 from google import genai
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+from src.models.resume import Resume
+from src.services.llm_cache import llm_cache
+from src.services.rate_limiter import gemini_limiter
 
 
 # Path to prompts configuration
 PROMPTS_PATH = Path(__file__).resolve().parents[1] / "config" / "prompts.json"
 
 
+# Serialized resumes kept per client, keyed by resume ID (see _resume_json).
+RESUME_JSON_CACHE_SIZE = 256
+
+# Gemini deletes uploaded files after 48 hours; reuse a handle only well before that.
+UPLOADED_FILE_TTL = 47 * 3600
+# Uploaded-file handles remembered per client for local paths.
+UPLOADED_PATH_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=1)
 def load_prompts() -> Dict[str, Any]:
-    """Load prompts configuration from JSON file."""
+    """Load prompts configuration from JSON file (parsed once per process).
+
+    The returned dict is shared between callers and must not be mutated.
+    """
     try:
-        with PROMPTS_PATH.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(PROMPTS_PATH.read_bytes())
     except FileNotFoundError:
         raise RuntimeError(
             f"Prompts configuration file not found at {PROMPTS_PATH}. "
             "Ensure config/prompts.json exists in the project root."
         )
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise RuntimeError(
             f"Invalid JSON in prompts configuration file {PROMPTS_PATH}: {e}"
         )
 
+@lru_cache(maxsize=None)
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """Build (once per schema) the adapter validating a JSON array of ``schema``."""
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=32)
+def _compile_template(
+    template: str, allowed: frozenset[str]
+) -> Tuple[Tuple[str, Optional[str], str], ...]:
+    """Split a ``str.format`` template into (literal, field, format spec) segments.
+
+    Parsing and placeholder validation happen once per template; rendering
+    with :func:`_render_template` is then a single join. Raises KeyError
+    naming the first placeholder not in ``allowed``, as ``str.format``
+    would at render time.
+    """
+    segments = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and field not in allowed:
+            raise KeyError(field)
+        if conversion:
+            raise ValueError(f"Unsupported conversion '!{conversion}' for placeholder '{field}'")
+        segments.append((literal, field, spec or ""))
+    return tuple(segments)
+
+
+def _render_template(segments: Tuple[Tuple[str, Optional[str], str], ...], **values: str) -> str:
+    return "".join(
+        literal + (format(values[field], spec) if field is not None else "")
+        for literal, field, spec in segments
+    )
+
+
+@lru_cache(maxsize=32)
+def _cached_json_schema(schema: type[BaseModel]) -> Dict[str, Any]:
+    """Return ``schema.model_json_schema()``, generated once per schema class.
+
+    The returned dict is shared between requests and must not be mutated.
+    """
+    return schema.model_json_schema()
+
+
+@lru_cache(maxsize=32)
+def _cached_list_json_schema(schema: type[BaseModel]) -> Dict[str, Any]:
+    """Return the JSON schema of an array of ``schema``, generated once per class."""
+    return _list_adapter(schema).json_schema()
+
+
+def _validate_response(adapter: Union[type[BaseModel], TypeAdapter], response: Any) -> Any:
+    """Validate a structured Gemini response with a model class or TypeAdapter.
+
+    When google-genai has already parsed the JSON (``response.parsed``),
+    the parsed value is validated directly instead of parsing the text again.
+    """
+    parsed = getattr(response, "parsed", None)
+    if isinstance(adapter, TypeAdapter):
+        if isinstance(parsed, list):
+            return adapter.validate_python(parsed)
+        return adapter.validate_json(response.text)
+    if isinstance(parsed, dict):
+        return adapter.model_validate(parsed)
+    if isinstance(parsed, adapter):
+        return parsed
+    return adapter.model_validate_json(response.text)
+
+
+@lru_cache(maxsize=None)
+def _genai_client(api_key: str) -> genai.Client:
+    """Return the process-wide google-genai client for ``api_key``.
+
+    Every ``GeminiClient`` with the same key shares one underlying client and
+    therefore one HTTP connection pool.
+    """
+    return genai.Client(api_key=api_key)
+
+
 class GeminiClient:
     """Wrapper around google-genai client for various LLM services."""
 
@@ -38,60 +138,235 @@ class GeminiClient:
             raise RuntimeError("GEMINI_API_KEY environment variable is not set.")
 
         # Configure client
-        os.environ["GOOGLE_API_KEY"] = self._api_key
-        self._client = genai.Client()
+        self._client = _genai_client(self._api_key)
         self._model = model
         self._prompts = load_prompts()
+        self._extraction_prompts: Dict[str, Any] = self._prompts.get("resume_extraction", {})
+        self._ats_prompts: Dict[str, Any] = self._prompts.get("ats_scoring", {})
+        self._resume_json_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._resume_json_lock = threading.Lock()
+        # Uploaded-file handles: paths by (path, mtime, size, MIME type), and
+        # streams by the stream object itself for as long as it is alive
+        self._path_uploads: "OrderedDict[Tuple[str, int, int, Optional[str]], Tuple[float, Any]]" = OrderedDict()
+        self._stream_uploads: "weakref.WeakKeyDictionary[Any, Tuple[float, Optional[str], Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._upload_lock = threading.Lock()
+        # Generation configs by (schema, list response, instruction, temperature)
+        self._configs: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    def _resume_json(self, resume_data: Dict[str, Any], resume_id: Optional[str] = None) -> str:
+        """Serialize resume data compactly for a prompt, reusing the result per resume ID.
 
-    def extract_resume(self, file_path: Union[str, Path], schema: type[BaseModel]) -> BaseModel:
+        With an ID, ``resume_data`` must be the stored resume body (see
+        ``resume_store.load_resume_body``), which never changes, so a resume
+        scored against many job descriptions is serialized once. The merged
+        view from ``load_parsed_resume`` must not be passed with an ID, since
+        its score and insight lists grow. Without an ID nothing is cached.
+        """
+        if resume_id is not None:
+            with self._resume_json_lock:
+                cached = self._resume_json_cache.get(resume_id)
+                if cached is not None:
+                    self._resume_json_cache.move_to_end(resume_id)
+                    return cached
+
+        resume_json = orjson.dumps(resume_data).decode("utf-8")
+
+        if resume_id is not None:
+            with self._resume_json_lock:
+                self._resume_json_cache[resume_id] = resume_json
+                while len(self._resume_json_cache) > RESUME_JSON_CACHE_SIZE:
+                    self._resume_json_cache.popitem(last=False)
+        return resume_json
+
+    def _structured_config(
+        self,
+        schema: type[BaseModel],
+        system_instruction: Optional[str],
+        as_list: bool = False,
+        temperature: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Return the generation config for a JSON response matching ``schema``.
+
+        Configs are built once per schema, instruction and temperature. The
+        returned dict is shared between requests and must not be mutated.
+        """
+        key = (schema, as_list, system_instruction, temperature)
+        config = self._configs.get(key)
+        if config is not None:
+            return config
+
+        json_schema = _cached_list_json_schema(schema) if as_list else _cached_json_schema(schema)
+        config = {
+            "response_mime_type": "application/json",
+            "response_json_schema": json_schema,
+        }
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+        if temperature is not None:
+            config["temperature"] = temperature
+        self._configs[key] = config
+        return config
+
+    def _upload(self, file: Union[str, Path, BinaryIO], mime_type: Optional[str] = None) -> Any:
+        """Upload a path or seekable binary stream via the Files API.
+
+        Streams (e.g. an ``UploadFile.file`` spool) are uploaded in place, so
+        no temporary copy on disk is needed; they require ``mime_type``.
+
+        Handles are reused while younger than ``UPLOADED_FILE_TTL``: a path
+        is uploaded again only if its mtime or size changed, and a stream is
+        uploaded once for its lifetime (e.g. a failed batch extraction
+        retried file by file uses the handles of the batch upload).
+        """
+        config = {"mime_type": mime_type} if mime_type else None
+        now = time.time()
+
+        if isinstance(file, io.IOBase):
+            with self._upload_lock:
+                cached = self._stream_uploads.get(file)
+            if cached is not None and cached[1] == mime_type and now - cached[0] < UPLOADED_FILE_TTL:
+                return cached[2]
+            file.seek(0)
+            uploaded = self._client.files.upload(file=file, config=config)
+            with self._upload_lock:
+                self._stream_uploads[file] = (now, mime_type, uploaded)
+            return uploaded
+
+        stat = Path(file).stat()
+        key = (str(file), stat.st_mtime_ns, stat.st_size, mime_type)
+        with self._upload_lock:
+            cached = self._path_uploads.get(key)
+        if cached is not None and now - cached[0] < UPLOADED_FILE_TTL:
+            return cached[1]
+        uploaded = self._client.files.upload(file=str(file), config=config)
+        with self._upload_lock:
+            self._path_uploads[key] = (now, uploaded)
+            self._path_uploads.move_to_end(key)
+            while len(self._path_uploads) > UPLOADED_PATH_CACHE_SIZE:
+                self._path_uploads.popitem(last=False)
+        return uploaded
+
+    def extract_resume(
+        self,
+        file_path: Union[str, Path, BinaryIO],
+        schema: type[BaseModel] = Resume,
+        mime_type: Optional[str] = None,
+    ) -> BaseModel:
         """Upload a resume file to Gemini and return a structured Resume.
 
         Parameters
         ----------
-        file_path: str | Path
-        prompts = self._prompts.get("resume_extraction")
+        file_path: str | Path | BinaryIO
+            Path or seekable binary stream of the resume file.
+        schema: type[BaseModel]
+            Pydantic model class describing the extracted resume.
+        mime_type: str | None
+            MIME type of the file; required for streams, inferred for paths.
+
+        Returns
+        -------
+        BaseModel
+            Parsed response matching the provided schema.
+
+        Raises
+        ------
+        ValueError
+            If the resume_extraction prompts are missing.
+        """
+        prompts = self._extraction_prompts
         if not prompts:
             raise ValueError(
                 "Missing 'resume_extraction' configuration in prompts file"
             )
-        
+
         system_instruction = prompts.get("system_instruction")
         user_prompt = prompts.get("user_prompt")
-        
+
         if not system_instruction or not user_prompt:
             raise ValueError(
                 "Missing required prompts: both 'system_instruction' and 'user_prompt' "
                 "must be present in resume_extraction configuration"
             )
+
+        # Upload file using Files API
+        uploaded_file = self._upload(file_path, mime_type)
+
+        with gemini_limiter.permit():
+            response = self._client.models.generate_content(
+                model=self._model,
+                contents=[user_prompt, uploaded_file],
+                config=self._structured_config(schema, system_instruction),
+            )
+
+        return _validate_response(schema, response)
+
+    def extract_resumes_batch(
+        self,
+        file_paths: Sequence[Union[str, Path, BinaryIO]],
+        schema: type[BaseModel],
+        mime_types: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[BaseModel]:
+        """Extract several resume files with a single Gemini request.
+
+        Parameters
+        ----------
+        file_paths: Sequence[str | Path | BinaryIO]
+            Paths or seekable binary streams of the resume files, each
+            uploaded via the Files API.
+        schema: type[BaseModel]
+            Pydantic model class describing one extracted resume.
+        mime_types: Sequence[str | None] | None
+            MIME type per file; required for streams, inferred for paths.
+
         Returns
         -------
-        BaseModel
-            Parsed response matching the provided schema.
+        List[BaseModel]
+            One parsed resume per input file, in the same order.
+
+        Raises
+        ------
+        ValueError
+            If the batch prompt is missing or the response does not contain
+            exactly one resume per file.
         """
-        prompts = self._prompts.get("resume_extraction", {})
+        prompts = self._extraction_prompts
         system_instruction = prompts.get("system_instruction", "")
-        user_prompt = prompts.get("user_prompt", "")
+        batch_prompt = prompts.get("batch_user_prompt", "")
+        if not batch_prompt:
+            raise ValueError(
+                "Missing 'batch_user_prompt' in resume_extraction prompts configuration"
+            )
 
-        # Upload file using Files API
-        uploaded_file = self._client.files.upload(file=str(file_path))
-
-        response = self._client.models.generate_content(
-            model=self._model,
-            contents=[user_prompt, uploaded_file],
-            config={
-                "response_mime_type": "application/json",
-                "response_json_schema": schema.model_json_schema(),
-                "system_instruction": system_instruction,
-            },
-        )
+        mime_types = mime_types or [None] * len(file_paths)
+        uploaded_files = [
+            self._upload(file_path, mime_type)
+            for file_path, mime_type in zip(file_paths, mime_types)
+        ]
+        list_adapter = _list_adapter(schema)
 
-        return schema.model_validate_json(response.text)
+        with gemini_limiter.permit():
+            response = self._client.models.generate_content(
+                model=self._model,
+                contents=[batch_prompt.format(count=len(uploaded_files)), *uploaded_files],
+                config=self._structured_config(schema, system_instruction, as_list=True),
+            )
+
+        resumes = _validate_response(list_adapter, response)
+        if len(resumes) != len(uploaded_files):
+            raise ValueError(
+                f"Batch extraction returned {len(resumes)} resumes for {len(uploaded_files)} files"
+            )
+        return resumes
 
     def score_resume_ats(
         self,
         resume_data: Dict[str, Any],
         job_description: str,
         schema: type[BaseModel],
+        use_cache: bool = True,
+        resume_id: Optional[str] = None,
     ) -> BaseModel:
         """Score a resume against a job description using ATS criteria.
 
@@ -103,6 +378,12 @@ class GeminiClient:
             Job description text to compare against.
         schema: type[BaseModel]
             Pydantic model class defining the expected ATS score output schema.
+        use_cache: bool
+            If True, reuse a cached response for an identical prompt instead
+            of calling Gemini.
+        resume_id: Optional[str]
+            ID of the stored resume, used to reuse its serialized form across
+            calls. Only pass it with the stored resume body as ``resume_data``.
 
         Returns
         -------
@@ -115,7 +396,7 @@ class GeminiClient:
             If required prompts are missing or invalid, or if prompt formatting fails.
         """
         # Validate that ats_scoring prompts exist
-        prompts = self._prompts.get("ats_scoring")
+        prompts = self._ats_prompts
         if not prompts:
             raise ValueError(
                 "Missing 'ats_scoring' configuration in prompts.json. "
@@ -139,12 +420,11 @@ class GeminiClient:
             )
 
         # Format the prompt with resume and job description
-        resume_json_str = json.dumps(resume_data, indent=2, ensure_ascii=False)
+        resume_json_str = self._resume_json(resume_data, resume_id)
         
         try:
-            user_prompt = user_prompt_template.format(
-                resume_json=resume_json_str,
-                job_description=job_description,
+            template = _compile_template(
+                user_prompt_template, frozenset({"resume_json", "job_description"})
             )
         except KeyError as e:
             missing_placeholder = str(e).strip("'")
@@ -153,15 +433,65 @@ class GeminiClient:
                 f"Expected placeholders: 'resume_json', 'job_description'. "
                 f"Template content: {user_prompt_template[:200]}..."
             ) from e
+        user_prompt = _render_template(
+            template,
+            resume_json=resume_json_str,
+            job_description=job_description,
+        )
 
-        response = self._client.models.generate_content(
-            model=self._model,
-            contents=[user_prompt],
-            config={
-                "response_mime_type": "application/json",
-                "response_json_schema": schema.model_json_schema(),
-                "system_instruction": system_instruction,
-            },
+        cache_key = llm_cache.cache_key(
+            self._model, f"{system_instruction}\n\n{user_prompt}", 0.0, schema.__name__
         )
+        if use_cache:
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                return schema.model_validate_json(cached)
+
+        with gemini_limiter.permit():
+            response = self._client.models.generate_content(
+                model=self._model,
+                contents=[user_prompt],
+                config=self._structured_config(schema, system_instruction),
+            )
+
+        result = _validate_response(schema, response)
+        # Stored compactly: the model may emit indented JSON
+        llm_cache.set(cache_key, result.model_dump_json())
+        return result
+
+    def stream_structured(
+        self,
+        prompt: str,
+        schema: type[BaseModel],
+        system_instruction: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Stream the JSON text of a structured response as it is generated.
+
+        Parameters
+        ----------
+        prompt: str
+            User prompt to send.
+        schema: type[BaseModel]
+            Pydantic model class the response JSON must conform to.
+        system_instruction: Optional[str]
+            Optional system instruction for the request.
+        temperature: Optional[float]
+            Sampling temperature; the model default is used if None.
 
-        return schema.model_validate_json(response.text)
+        Returns
+        -------
+        Iterator[str]
+            Successive text chunks; concatenated they form the full JSON
+            document, which the caller validates against ``schema``.
+        """
+        config = self._structured_config(schema, system_instruction, temperature=temperature)
+        # The permit is held until the stream is exhausted or closed
+        with gemini_limiter.permit():
+            for chunk in self._client.models.generate_content_stream(
+                model=self._model,
+                contents=[prompt],
+                config=config,
+            ):
+                if chunk.text:
+                    yield chunk.text
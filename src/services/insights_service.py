@@ -3,34 +3,264 @@ Insights service for salary recommendations and upskilling.
 Refactored to use deep agents with structured outputs.
 """
 
+import asyncio
 import os
-from typing import Optional
+import string
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from pydantic_core import from_json
 from src.storage.resume_store import (
     load_parsed_resume,
     save_salary_insights,
     save_upskilling_report,
 )
-from src.models.insights import SalaryRecommendation, UpskillingReport
-from src.services.deep_agent_salary import SalaryResearchAgent
+from src.config.agent_config import (
+    SALARY_AGENT_CONFIG,
+    UPSKILLING_AGENT_CONFIG,
+    UPSKILLING_SYSTEM_PROMPT,
+    build_salary_research_query,
+)
+from src.models.insights import SalaryRecommendation, SemanticMatch, UpskillingReport
+from src.services.gemini_client import GeminiClient
+from src.services.llm_cache import llm_cache
+from src.services.rate_limiter import gemini_limiter
+from src.services.semantic_cache import semantic_cache
+
+if TYPE_CHECKING:
+    from src.services.deep_agent_salary import SalaryResearchAgent
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _partial_models(chunks: Iterable[str], schema: Type[M]) -> Generator[M, None, str]:
+    """Yield unvalidated snapshots of ``schema`` while its JSON text streams in.
+
+    Each time the buffered text parses (with open strings and containers
+    auto-closed, by pydantic-core's partial JSON parser) to a new object, a
+    ``schema.model_construct`` snapshot is yielded; missing fields take their
+    defaults. Returns the complete text so the caller can validate the final
+    document once.
+    """
+    buffer = ""
+    last = None
+    for chunk in chunks:
+        buffer += chunk
+        try:
+            partial = from_json(buffer, allow_partial="trailing-strings")
+        except ValueError:
+            continue
+        if isinstance(partial, dict) and partial != last:
+            last = partial
+            yield schema.model_construct(**partial)
+    return buffer
+
+
+class _SalaryRequest(NamedTuple):
+    """Resolved inputs and cache keys for one salary recommendation."""
+    job_title: str
+    location: str
+    experience_years: int
+    skills: List[str]
+    cache_key: str
+    semantic_text: str
+    semantic_guard: str
+
+
+class _UpskillingRequest(NamedTuple):
+    """Resolved inputs and cache keys for one upskilling report."""
+    target_role: str
+    prompt: str
+    cache_key: str
+    semantic_text: str
+    semantic_guard: str
+
+
+def _salary_semantic_key(
+    job_title: str,
+    location: str,
+    experience_years: int,
+    skills: List[str],
+) -> Tuple[str, str]:
+    """Build the (text, guard) pair for semantic lookup of a salary request.
+
+    The guard pins the country (last component of the location) and a
+    two-year experience bucket, which must match exactly; paraphrased titles
+    and reordered skills are left to embedding similarity.
+    """
+    bucket = experience_years // 2
+    country = location.rsplit(",", 1)[-1].strip().lower()
+    text = f"{job_title}|{location}|{sorted(s.lower() for s in skills)}|{bucket}"
+    return text, f"{country}|{bucket}"
+
+
+def _upskilling_semantic_key(
+    current_role: str,
+    target_role: str,
+    skills: List[str],
+    ats_gaps: List[str],
+    ats_missing: List[str],
+) -> Tuple[str, str]:
+    """Build the (text, guard) pair for semantic lookup of an upskilling request."""
+    text = (
+        f"{current_role}|{target_role}|{sorted(s.lower() for s in islice(skills, 6))}"
+        f"|{sorted(islice(ats_gaps, 5))}|{sorted(islice(ats_missing, 5))}"
+    )
+    return text, " ".join(target_role.lower().split())
+
+
+def _cached(
+    schema: Type[M],
+    request: Union[_SalaryRequest, _UpskillingRequest],
+    near_duplicates: bool,
+) -> Optional[M]:
+    """Return the cached result for ``request``, or None.
+
+    Only with ``near_duplicates`` is the semantic cache consulted; a result
+    found there belongs to a similar request, so it comes back flagged by
+    ``approximate_match`` and is never copied into the exact cache.
+    """
+    cached = llm_cache.get(request.cache_key)
+    if cached is not None:
+        return schema.model_validate_json(cached)
+    if near_duplicates:
+        hit = semantic_cache.lookup(schema.__name__, request.semantic_text, request.semantic_guard)
+        if hit is not None:
+            result = schema.model_validate_json(hit.response)
+            result.approximate_match = SemanticMatch(similarity=hit.similarity)
+            return result
+    return None
 
 
 class InsightsService:
     """Service for generating salary and upskilling insights using deep agents."""
     
+    # Every line is always present (empty when there is no ATS context), so
+    # all upskilling prompts share one byte layout
+    _UPSKILLING_PROMPT = string.Template(
+        "Current: $current\n"
+        "Target: $target\n"
+        "Skills: $skills\n"
+        "ATS Gaps: $gaps\n"
+        "Missing Keywords: $missing"
+    )
+    
     def __init__(self):
-        """Initialize with deep agent for salary research."""
-        # Initialize salary research agent with structured outputs
-        self.salary_agent = SalaryResearchAgent(
-            gemini_api_key=os.getenv("GEMINI_API_KEY"),
-            tavily_api_key=os.getenv("TAVILY_API_KEY"),
+        """Initialize the service; models and agents are created on first use."""
+        # Salary research agent with structured outputs (see salary_agent)
+        self._salary_agent: Optional["SalaryResearchAgent"] = None
+        self._salary_agent_lock = threading.Lock()
+        # Streaming clients, created on first use per model name
+        self._stream_clients: Dict[str, GeminiClient] = {}
+        # Structured-output upskilling model, built on first use
+        self._upskilling_runnable: Any = None
+    
+    @property
+    def salary_agent(self) -> "SalaryResearchAgent":
+        """The salary research agent, built (with its LangChain stack) on first use."""
+        if self._salary_agent is None:
+            with self._salary_agent_lock:
+                if self._salary_agent is None:
+                    from src.services.deep_agent_salary import SalaryResearchAgent
+                    
+                    self._salary_agent = SalaryResearchAgent(
+                        gemini_api_key=os.getenv("GEMINI_API_KEY"),
+                        tavily_api_key=os.getenv("TAVILY_API_KEY"),
+                    )
+        return self._salary_agent
+    
+    def _stream_client(self, model: str) -> GeminiClient:
+        client = self._stream_clients.get(model)
+        if client is None:
+            client = self._stream_clients[model] = GeminiClient(model=model)
+        return client
+    
+    def _prepare_salary(
+        self,
+        resume_data: Dict[str, Any],
+        job_title: Optional[str],
+        location: Optional[str],
+        experience_years: Optional[int],
+    ) -> _SalaryRequest:
+        """Fill in defaults from the resume and build the cache keys."""
+        # Extract candidate information
+        skills = resume_data.get('skills', [])[:8]  # Top 8 skills
+        experience = resume_data.get('experience', [])
+        
+        # Get location from resume if not provided
+        if not location:
+            contact = resume_data.get('contact', {})
+            location = contact.get('location', 'United States') if contact else 'United States'
+        
+        # Get job title from resume if not provided
+        if not job_title and experience:
+            job_title = experience[0].get('job_title', 'Software Engineer')
+        elif not job_title:
+            job_title = 'Software Engineer'
+        
+        # Calculate experience years if not provided
+        if not experience_years:
+            experience_years = len(experience) * 2  # Heuristic: ~2 years per role
+        
+        # Identical research requests are served from the LLM cache; keyed
+        # by the agent's own query so cache hits never import or build the agent
+        query = build_salary_research_query(job_title, location, experience_years, skills)
+        cache_key = llm_cache.cache_key(
+            SALARY_AGENT_CONFIG["model"],
+            query,
+            SALARY_AGENT_CONFIG["temperature"],
+            SalaryRecommendation.__name__,
+        )
+        # Near-duplicate requests (same country and experience bucket) are
+        # served from the semantic cache
+        semantic_text, semantic_guard = _salary_semantic_key(
+            job_title, location, experience_years, skills
+        )
+        return _SalaryRequest(
+            job_title, location, experience_years, skills,
+            cache_key, semantic_text, semantic_guard,
+        )
+    
+    def _finish_salary(
+        self,
+        resume_id: str,
+        request: _SalaryRequest,
+        salary_recommendation: SalaryRecommendation,
+        fresh: bool,
+    ) -> SalaryRecommendation:
+        """Cache a freshly generated recommendation and save it to the resume.
+        
+        A recommendation reused from a similar request is returned as is.
+        """
+        if salary_recommendation.approximate_match is not None:
+            return salary_recommendation
+        response = salary_recommendation.model_dump_json()
+        if fresh:
+            llm_cache.set(request.cache_key, response)
+            semantic_cache.store(
+                SalaryRecommendation.__name__, request.semantic_text, request.semantic_guard, response
+            )
+        
+        # Save salary insights to resume JSON
+        save_salary_insights(
+            resume_id=resume_id,
+            salary_data=response,
+            job_title=request.job_title,
+            location=request.location,
         )
+        return salary_recommendation
     
     def get_salary_recommendation(
         self,
         resume_id: str,
         job_title: Optional[str] = None,
         location: Optional[str] = None,
-        experience_years: Optional[int] = None
+        experience_years: Optional[int] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
     ) -> SalaryRecommendation:
         """
         Generate salary recommendation using deep agent with structured output.
@@ -40,6 +270,9 @@ class InsightsService:
             job_title: Target job title (uses resume's current role if not provided)
             location: Target location (uses resume's location if not provided)
             experience_years: Years of experience (calculated from resume if not provided)
+            resume_data: Already loaded resume data (loaded from the store if not provided)
+            near_duplicates: If True and this exact request is not cached, reuse the
+                recommendation of a similar one (flagged by approximate_match, not saved)
         
         Returns:
             SalaryRecommendation with structured market analysis
@@ -48,76 +281,121 @@ class InsightsService:
             RuntimeError: If resume not found or research fails
         """
         # Load resume data
-        resume_data = load_parsed_resume(resume_id)
+        resume_data = resume_data or load_parsed_resume(resume_id)
         if not resume_data:
             raise RuntimeError(f"Resume {resume_id} not found")
         
-        # Extract candidate information
-        skills = resume_data.get('skills', [])[:8]  # Top 8 skills
-        experience = resume_data.get('experience', [])
-        
-        # Get location from resume if not provided
-        if not location:
-            contact = resume_data.get('contact', {})
-            location = contact.get('location', 'United States') if contact else 'United States'
-        
-        # Get job title from resume if not provided
-        if not job_title and experience:
-            job_title = experience[0].get('job_title', 'Software Engineer')
-        elif not job_title:
-            job_title = 'Software Engineer'
-        
-        # Calculate experience years if not provided
-        if not experience_years:
-            experience_years = len(experience) * 2  # Heuristic: ~2 years per role
-        
         # Use deep agent for salary research with structured output
         try:
-            salary_recommendation = self.salary_agent.research_salary(
-                job_title=job_title,
-                location=location,
-                experience_years=experience_years,
-                skills=skills,
-            )
+            request = self._prepare_salary(resume_data, job_title, location, experience_years)
+            salary_recommendation = _cached(SalaryRecommendation, request, near_duplicates)
+            fresh = salary_recommendation is None
+            if fresh:
+                salary_recommendation = self.salary_agent.research_salary(
+                    job_title=request.job_title,
+                    location=request.location,
+                    experience_years=request.experience_years,
+                    skills=request.skills,
+                )
+            return self._finish_salary(resume_id, request, salary_recommendation, fresh)
             
-            # Save salary insights to resume JSON
-            save_salary_insights(
-                resume_id=resume_id,
-                salary_data=salary_recommendation.model_dump(mode="json"),
-                job_title=job_title,
-                location=location,
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate salary recommendation: {e}")
+    
+    async def aget_salary_recommendation(
+        self,
+        resume_id: str,
+        job_title: Optional[str] = None,
+        location: Optional[str] = None,
+        experience_years: Optional[int] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
+    ) -> SalaryRecommendation:
+        """Async variant of :meth:`get_salary_recommendation` using the agent's async API.
+        
+        Store and cache access runs in worker threads to keep the event loop free.
+        """
+        resume_data = resume_data or await asyncio.to_thread(load_parsed_resume, resume_id)
+        if not resume_data:
+            raise RuntimeError(f"Resume {resume_id} not found")
+        
+        try:
+            request = self._prepare_salary(resume_data, job_title, location, experience_years)
+            salary_recommendation = await asyncio.to_thread(_cached, SalaryRecommendation, request, near_duplicates)
+            fresh = salary_recommendation is None
+            if fresh:
+                salary_recommendation = await self.salary_agent.aresearch_salary(
+                    job_title=request.job_title,
+                    location=request.location,
+                    experience_years=request.experience_years,
+                    skills=request.skills,
+                )
+            return await asyncio.to_thread(
+                self._finish_salary, resume_id, request, salary_recommendation, fresh
             )
             
-            return salary_recommendation
-            
         except Exception as e:
             raise RuntimeError(f"Failed to generate salary recommendation: {e}")
     
-    def get_upskilling_recommendations(
+    def stream_salary_recommendation(
         self,
         resume_id: str,
-        job_description_hash: Optional[str] = None,
-        target_role: Optional[str] = None
-    ) -> UpskillingReport:
+        job_title: Optional[str] = None,
+        location: Optional[str] = None,
+        experience_years: Optional[int] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
+    ) -> Iterator[SalaryRecommendation]:
         """
-        Generate upskilling recommendations with structured output.
+        Generate a salary recommendation through the streaming interface.
+        
+        The research agent returns its structured answer as the final step of
+        a tool-using loop, so there are no partial snapshots: this yields the
+        validated recommendation once, matching the interface of
+        :meth:`stream_upskilling_recommendations`.
         
         Args:
             resume_id: UUID of the resume
-            job_description_hash: Hash of job description for ATS score lookup (optional)
-            target_role: Target role for upskilling (optional)
+            job_title: Target job title (uses resume's current role if not provided)
+            location: Target location (uses resume's location if not provided)
+            experience_years: Years of experience (calculated from resume if not provided)
+            resume_data: Already loaded resume data (loaded from the store if not provided)
+            near_duplicates: If True and this exact request is not cached, reuse the
+                recommendation of a similar one (flagged by approximate_match, not saved)
         
-        Returns:
-            UpskillingReport with structured skill gaps and learning resources
+        Yields:
+            The SalaryRecommendation
         
         Raises:
-            RuntimeError: If resume not found or generation fails
+            RuntimeError: If resume not found or research fails
         """
-        # Load resume data
-        resume_data = load_parsed_resume(resume_id)
+        resume_data = resume_data or load_parsed_resume(resume_id)
         if not resume_data:
             raise RuntimeError(f"Resume {resume_id} not found")
         
+        try:
+            request = self._prepare_salary(resume_data, job_title, location, experience_years)
+            salary_recommendation = _cached(SalaryRecommendation, request, near_duplicates)
+            fresh = salary_recommendation is None
+            if fresh:
+                salary_recommendation = self.salary_agent.research_salary(
+                    job_title=request.job_title,
+                    location=request.location,
+                    experience_years=request.experience_years,
+                    skills=request.skills,
+                )
+            yield self._finish_salary(resume_id, request, salary_recommendation, fresh)
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate salary recommendation: {e}")
+    
+    def _prepare_upskilling(
+        self,
+        resume_data: Dict[str, Any],
+        job_description_hash: Optional[str],
+        target_role: Optional[str],
+    ) -> _UpskillingRequest:
+        """Build the upskilling prompt and its cache keys from the resume."""
         # Extract candidate information
         skills = resume_data.get('skills', [])
         experience = resume_data.get('experience', [])
@@ -139,45 +417,257 @@ class InsightsService:
                 ats_gaps = ats_data.get('gaps', [])
                 ats_missing = ats_data.get('missing_keywords', [])
         
-        # Create optimized prompt
-        prompt = f"""Analyze skill gaps and create learning path.
-
-Current: {current_role}
-Target: {target_role}
-Skills: {', '.join(skills[:10])}
-{f"ATS Gaps: {', '.join(ats_gaps[:5])}" if ats_gaps else ""}
-{f"Missing Keywords: {', '.join(ats_missing[:5])}" if ats_missing else ""}
-
-Provide:
-1. Identified gaps (skills to learn)
-2. Target skills for {target_role}
-3. Learning resources (15-20 items: videos, docs, courses)
-4. Structured learning path (3-4 phases)
-5. Practice projects (3-5 projects)
-6. Total duration estimate
-7. Expected career impact"""
+        # Only the candidate-specific fields; the task lives in the system prompt
+        prompt = self._UPSKILLING_PROMPT.substitute(
+            current=current_role,
+            target=target_role,
+            skills=", ".join(islice(skills, 6)),
+            gaps=", ".join(islice(ats_gaps, 5)),
+            missing=", ".join(islice(ats_missing, 5)),
+        )
         
-        # Use Gemini with structured output
-        try:
+        cache_key = llm_cache.cache_key(
+            UPSKILLING_AGENT_CONFIG["model"],
+            f"{UPSKILLING_SYSTEM_PROMPT}\n\n{prompt}",
+            UPSKILLING_AGENT_CONFIG["temperature"],
+            UpskillingReport.__name__,
+        )
+        semantic_text, semantic_guard = _upskilling_semantic_key(
+            current_role, target_role, skills, ats_gaps, ats_missing
+        )
+        return _UpskillingRequest(target_role, prompt, cache_key, semantic_text, semantic_guard)
+    
+    def _upskilling_call(self, prompt: str) -> Tuple[Any, List[Tuple[str, str]]]:
+        """Gemini chat model bound to the UpskillingReport output schema, and its messages."""
+        runnable = self._upskilling_runnable
+        if runnable is None:
             from langchain_google_genai import ChatGoogleGenerativeAI
             
             model = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                temperature=0.2,
+                model=UPSKILLING_AGENT_CONFIG["model"],
+                temperature=UPSKILLING_AGENT_CONFIG["temperature"],
                 api_key=os.getenv("GEMINI_API_KEY"),
             )
+            runnable = self._upskilling_runnable = model.with_structured_output(UpskillingReport)
+        return runnable, [("system", UPSKILLING_SYSTEM_PROMPT), ("human", prompt)]
+    
+    def _finish_upskilling(
+        self,
+        resume_id: str,
+        request: _UpskillingRequest,
+        upskilling_report: UpskillingReport,
+        fresh: bool,
+    ) -> UpskillingReport:
+        """Cache a freshly generated report and save it to the resume.
+        
+        A report reused from a similar request is returned as is.
+        """
+        if upskilling_report.approximate_match is not None:
+            return upskilling_report
+        response = upskilling_report.model_dump_json()
+        if fresh:
+            llm_cache.set(request.cache_key, response)
+            semantic_cache.store(
+                UpskillingReport.__name__, request.semantic_text, request.semantic_guard, response
+            )
+        
+        # Save upskilling report to resume JSON
+        save_upskilling_report(
+            resume_id=resume_id,
+            upskilling_data=response,
+            target_role=request.target_role,
+        )
+        return upskilling_report
+    
+    def get_upskilling_recommendations(
+        self,
+        resume_id: str,
+        job_description_hash: Optional[str] = None,
+        target_role: Optional[str] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
+    ) -> UpskillingReport:
+        """
+        Generate upskilling recommendations with structured output.
+        
+        Args:
+            resume_id: UUID of the resume
+            job_description_hash: Hash of job description for ATS score lookup (optional)
+            target_role: Target role for upskilling (optional)
+            resume_data: Already loaded resume data (loaded from the store if not provided)
+            near_duplicates: If True and this exact request is not cached, reuse the
+                report of a similar one (flagged by approximate_match, not saved)
+        
+        Returns:
+            UpskillingReport with structured skill gaps and learning resources
+        
+        Raises:
+            RuntimeError: If resume not found or generation fails
+        """
+        # Load resume data
+        resume_data = resume_data or load_parsed_resume(resume_id)
+        if not resume_data:
+            raise RuntimeError(f"Resume {resume_id} not found")
+        
+        request = self._prepare_upskilling(resume_data, job_description_hash, target_role)
+        
+        # Use Gemini with structured output
+        try:
+            upskilling_report = _cached(UpskillingReport, request, near_duplicates)
+            fresh = upskilling_report is None
+            if fresh:
+                # Get structured output directly mapped to Pydantic model
+                model, messages = self._upskilling_call(request.prompt)
+                with gemini_limiter.permit():
+                    upskilling_report = model.invoke(messages)
+            return self._finish_upskilling(resume_id, request, upskilling_report, fresh)
             
-            # Get structured output directly mapped to Pydantic model
-            upskilling_report = model.with_structured_output(UpskillingReport).invoke(prompt)
-            
-            # Save upskilling report to resume JSON
-            save_upskilling_report(
-                resume_id=resume_id,
-                upskilling_data=upskilling_report.model_dump(mode="json"),
-                target_role=target_role,
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate upskilling recommendations: {e}")
+    
+    async def aget_upskilling_recommendations(
+        self,
+        resume_id: str,
+        job_description_hash: Optional[str] = None,
+        target_role: Optional[str] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
+    ) -> UpskillingReport:
+        """Async variant of :meth:`get_upskilling_recommendations` using the model's async API.
+        
+        Store and cache access runs in worker threads to keep the event loop free.
+        """
+        resume_data = resume_data or await asyncio.to_thread(load_parsed_resume, resume_id)
+        if not resume_data:
+            raise RuntimeError(f"Resume {resume_id} not found")
+        
+        request = self._prepare_upskilling(resume_data, job_description_hash, target_role)
+        
+        try:
+            upskilling_report = await asyncio.to_thread(_cached, UpskillingReport, request, near_duplicates)
+            fresh = upskilling_report is None
+            if fresh:
+                model, messages = await asyncio.to_thread(self._upskilling_call, request.prompt)
+                async with gemini_limiter.permit():
+                    upskilling_report = await model.ainvoke(messages)
+            return await asyncio.to_thread(
+                self._finish_upskilling, resume_id, request, upskilling_report, fresh
             )
             
-            return upskilling_report
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate upskilling recommendations: {e}")
+    
+    def stream_upskilling_recommendations(
+        self,
+        resume_id: str,
+        job_description_hash: Optional[str] = None,
+        target_role: Optional[str] = None,
+        resume_data: Optional[Dict[str, Any]] = None,
+        near_duplicates: bool = False,
+    ) -> Iterator[UpskillingReport]:
+        """
+        Stream an upskilling report as its fields are generated.
+        
+        Intermediate items are unvalidated partial models (built with
+        ``model_construct``); the last item is fully validated and is the one
+        cached and saved. A cache hit yields a single item.
+        
+        Args:
+            resume_id: UUID of the resume
+            job_description_hash: Hash of job description for ATS score lookup (optional)
+            target_role: Target role for upskilling (optional)
+            resume_data: Already loaded resume data (loaded from the store if not provided)
+            near_duplicates: If True and this exact request is not cached, reuse the
+                report of a similar one (flagged by approximate_match, not saved)
+        
+        Yields:
+            Progressively more complete UpskillingReport snapshots
+        
+        Raises:
+            RuntimeError: If resume not found or generation fails
+        """
+        resume_data = resume_data or load_parsed_resume(resume_id)
+        if not resume_data:
+            raise RuntimeError(f"Resume {resume_id} not found")
+        
+        request = self._prepare_upskilling(resume_data, job_description_hash, target_role)
+        
+        try:
+            upskilling_report = _cached(UpskillingReport, request, near_duplicates)
+            if upskilling_report is not None:
+                yield self._finish_upskilling(resume_id, request, upskilling_report, fresh=False)
+                return
+            
+            chunks = self._stream_client(UPSKILLING_AGENT_CONFIG["model"]).stream_structured(
+                request.prompt,
+                UpskillingReport,
+                system_instruction=UPSKILLING_SYSTEM_PROMPT,
+                temperature=UPSKILLING_AGENT_CONFIG["temperature"],
+            )
+            text = yield from _partial_models(chunks, UpskillingReport)
+            upskilling_report = UpskillingReport.model_validate_json(text)
+            yield self._finish_upskilling(resume_id, request, upskilling_report, fresh=True)
             
         except Exception as e:
-            raise RuntimeError(f"Failed to generate upskilling recommendations: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to generate upskilling recommendations: {e}")
+    
+    async def get_all_insights(
+        self,
+        resume_id: str,
+        job_title: Optional[str] = None,
+        location: Optional[str] = None,
+        experience_years: Optional[int] = None,
+        job_description_hash: Optional[str] = None,
+        target_role: Optional[str] = None,
+        near_duplicates: bool = False,
+    ) -> Tuple[SalaryRecommendation, UpskillingReport]:
+        """
+        Generate salary and upskilling insights concurrently.
+        
+        The resume is loaded once and shared by both requests, which run
+        side by side instead of back to back. If either fails (or this call
+        is cancelled), the other is cancelled too.
+        
+        Args:
+            resume_id: UUID of the resume
+            job_title: Target job title for salary research (optional)
+            location: Target location for salary research (optional)
+            experience_years: Years of experience (optional)
+            job_description_hash: Hash of job description for ATS score lookup (optional)
+            target_role: Target role for upskilling (optional)
+            near_duplicates: If True, either insight may be reused from a similar request
+        
+        Returns:
+            Tuple of (SalaryRecommendation, UpskillingReport)
+        
+        Raises:
+            RuntimeError: If either insight fails to generate
+        """
+        resume_data = await asyncio.to_thread(load_parsed_resume, resume_id)
+        tasks = [
+            asyncio.ensure_future(self.aget_salary_recommendation(
+                resume_id,
+                job_title=job_title,
+                location=location,
+                experience_years=experience_years,
+                resume_data=resume_data,
+                near_duplicates=near_duplicates,
+            )),
+            asyncio.ensure_future(self.aget_upskilling_recommendations(
+                resume_id,
+                job_description_hash=job_description_hash,
+                target_role=target_role,
+                resume_data=resume_data,
+                near_duplicates=near_duplicates,
+            )),
+        ]
+        try:
+            salary, upskilling = await asyncio.gather(*tasks)
+        except BaseException:
+            # gather leaves the other request running; cancel it (as a
+            # TaskGroup would on 3.11+) and wait for it to finish
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return salary, upskilling
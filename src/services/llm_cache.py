@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import orjson
+
+from src.config.agent_config import LLM_CACHE_CONFIG
+from src.storage.sqlite_store import get_connection
+
+
+class LLMCache:
+    """Exact-match cache of LLM responses, persisted in the SQLite store.
+
+    Entries are keyed by a SHA-256 of everything that determines the output
+    (model, prompt, temperature, output schema) and expire after
+    ``ttl_seconds``. The ``memory_size`` most recently used entries are
+    also kept in process, so repeated requests skip the SQLite query.
+    Expired rows are deleted by ``set``, at most once per
+    ``_PRUNE_INTERVAL`` seconds. ``hits`` and ``misses`` count lookups
+    since start-up.
+    """
+
+    _PRUNE_INTERVAL = 3600
+
+    def __init__(self, ttl_seconds: Optional[int] = None, memory_size: int = 0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._last_prune = 0.0
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        if not self.memory_size:
+            return
+        with self._lock:
+            self._memory[key] = (response, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _prune_expired(self, now: int) -> None:
+        if self.ttl_seconds is None:
+            return
+        with self._lock:
+            if now - self._last_prune < self._PRUNE_INTERVAL:
+                return
+            self._last_prune = now
+        get_connection().execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+
+    def _fresh(self, created_at: float) -> bool:
+        return self.ttl_seconds is None or time.time() - created_at < self.ttl_seconds
+
+    @staticmethod
+    def cache_key(model: str, prompt: str, temperature: float, schema_name: str) -> str:
+        """Return the cache key for one LLM request."""
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "prompt": prompt,
+                "temperature": temperature,
+                "schema": schema_name,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for ``key``, or None if absent or expired."""
+        with self._lock:
+            row = self._memory.get(key)
+            if row is not None:
+                self._memory.move_to_end(key)
+        if row is None:
+            row = get_connection().execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._fresh(row[1]):
+                self._remember(key, row[0], row[1])
+        hit = row is not None and self._fresh(row[1])
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if hit else None
+
+    def set(self, key: str, response: str) -> None:
+        """Store (or replace) the response text for ``key``."""
+        created_at = int(time.time())
+        self._remember(key, response, created_at)
+        get_connection().execute(
+            "INSERT INTO llm_cache (key, response, created_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET response = excluded.response, "
+            "created_at = excluded.created_at",
+            (key, response, created_at),
+        )
+        self._prune_expired(created_at)
+
+
+# Process-wide cache shared by the Gemini-backed services.
+llm_cache = LLMCache(**LLM_CACHE_CONFIG)
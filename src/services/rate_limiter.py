@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from src.config.agent_config import GEMINI_RATE_LIMIT_CONFIG
+
+
+def _is_overload(exc: Optional[BaseException]) -> bool:
+    """Return True if ``exc`` (or anything it wraps) is a 429 or a timeout.
+
+    Services re-raise provider errors as ``RuntimeError``, so the exception
+    chain is walked instead of only checking the outermost type.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        if 429 in (getattr(exc, "code", None), getattr(exc, "status_code", None)):
+            return True
+        if type(exc).__name__ == "ResourceExhausted":
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe limiter bounding concurrent calls to an LLM provider.
+
+    Concurrency follows an AIMD (additive increase, multiplicative decrease)
+    policy: after each window of successful calls whose mean latency is within
+    ``target_latency`` the limit grows by ``increase`` permits, and every
+    429/timeout multiplies it by ``decrease``. Independently, a sliding window
+    of start timestamps keeps the request rate under ``requests_per_minute``.
+
+    Services hold a permit only around the provider call itself, so cached
+    responses never consume one. Permits work from worker threads and from
+    coroutines::
+
+        with gemini_limiter.permit():
+            response = client.models.generate_content(...)
+
+        async with gemini_limiter.permit():
+            result = await model.ainvoke(messages)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        requests_per_minute: Optional[int] = None,
+        target_latency: float = 30.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+
+        self._limit = float(max_concurrency)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._starts: Deque[float] = deque()
+        self._window_count = 0
+        self._window_latency = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current number of permits (never below ``min_concurrency``)."""
+        return max(self.min_concurrency, int(self._limit))
+
+    def permit(self) -> "_Permit":
+        """Return a context manager (sync or async) holding one permit."""
+        return _Permit(self)
+
+    def _rate_delay(self, now: float) -> float:
+        """Seconds until the rate window admits another call (0 if it does now)."""
+        if not self.requests_per_minute:
+            return 0.0
+        while self._starts and now - self._starts[0] >= 60.0:
+            self._starts.popleft()
+        if len(self._starts) < self.requests_per_minute:
+            return 0.0
+        return 60.0 - (now - self._starts[0])
+
+    def _acquire(self, blocking: bool = True) -> Optional[float]:
+        """Take a permit and return its start time (None if not ``blocking`` and none is free)."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                delay = self._rate_delay(now) if self._in_flight < self.limit else None
+                if delay == 0.0:
+                    self._in_flight += 1
+                    if self.requests_per_minute:
+                        self._starts.append(now)
+                    return now
+                if not blocking:
+                    return None
+                # Woken early by a release, or once the oldest start leaves the window
+                self._condition.wait(delay)
+
+    def _release(self, started: float, exc: Optional[BaseException], record: bool = True) -> None:
+        latency = time.monotonic() - started
+        with self._condition:
+            if record:
+                self._record(latency, exc)
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _record(self, latency: float, exc: Optional[BaseException]) -> None:
+        """Apply the AIMD policy for one finished call (caller holds the condition)."""
+        if _is_overload(exc):
+            self._limit = max(float(self.min_concurrency), self._limit * self.decrease)
+            self._window_count = 0
+            self._window_latency = 0.0
+        elif exc is None:
+            self._window_count += 1
+            self._window_latency += latency
+            if self._window_count >= self.limit:
+                if self._window_latency / self._window_count <= self.target_latency:
+                    self._limit = min(float(self.max_concurrency), self._limit + self.increase)
+                self._window_count = 0
+                self._window_latency = 0.0
+
+
+class _Permit:
+    """One permit of an :class:`AdaptiveRateLimiter`, held for a ``with`` block."""
+
+    __slots__ = ("_limiter", "_started", "_lock", "_abandoned")
+
+    def __init__(self, limiter: AdaptiveRateLimiter) -> None:
+        self._limiter = limiter
+        self._started: Optional[float] = None
+        self._lock: Optional[threading.Lock] = None
+        self._abandoned = False
+
+    def __enter__(self) -> "_Permit":
+        self._started = self._limiter._acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._limiter._release(self._started, exc)
+
+    async def __aenter__(self) -> "_Permit":
+        self._started = self._limiter._acquire(blocking=False)
+        if self._started is None:
+            # Wait in a worker thread so the event loop keeps running
+            self._lock = threading.Lock()
+            try:
+                await asyncio.to_thread(self._acquire_unless_abandoned)
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._abandoned = True
+                    if self._started is not None:
+                        self._limiter._release(self._started, None, record=False)
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._limiter._release(self._started, exc)
+
+    def _acquire_unless_abandoned(self) -> None:
+        started = self._limiter._acquire()
+        with self._lock:
+            if self._abandoned:
+                # The waiting coroutine was cancelled; hand the permit straight back
+                self._limiter._release(started, None, record=False)
+            else:
+                self._started = started
+
+
+def _config_from_env() -> dict:
+    config = dict(GEMINI_RATE_LIMIT_CONFIG)
+    if os.getenv("GEMINI_MAX_CONCURRENCY"):
+        config["max_concurrency"] = int(os.environ["GEMINI_MAX_CONCURRENCY"])
+    if os.getenv("GEMINI_RPM"):
+        config["requests_per_minute"] = int(os.environ["GEMINI_RPM"])
+    return config
+
+
+# Process-wide limiter shared by every Gemini call made by the services.
+gemini_limiter = AdaptiveRateLimiter(**_config_from_env())
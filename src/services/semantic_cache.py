@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import threading
+import time
+from array import array
+from functools import lru_cache
+from operator import mul
+from typing import List, NamedTuple, Optional, Sequence
+
+from src.config.agent_config import SEMANTIC_CACHE_CONFIG
+from src.services.rate_limiter import gemini_limiter
+from src.storage.sqlite_store import get_connection, transaction
+
+
+def _normalize(vector: Sequence[float]) -> array:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return array("f", (v / norm for v in vector))
+
+
+class SemanticHit(NamedTuple):
+    """A cached response and the similarity of the request it was stored for."""
+    response: str
+    similarity: float
+
+
+class SemanticCache:
+    """Similarity cache of LLM responses for paraphrased requests.
+
+    Each entry stores a unit-normalized embedding of a canonical request
+    string together with the response text. A lookup embeds the new request
+    and returns the stored response whose embedding has the highest cosine
+    similarity, if it reaches ``threshold``.
+
+    Only entries with the same ``namespace`` (response type) and ``guard``
+    are compared. The guard holds the fields that must match exactly, such
+    as country and experience bucket, so that "similar" requests with
+    different meanings never share an answer. Candidates are filtered by
+    that index first, so a flat scan over the survivors is enough.
+
+    Storing the same text again replaces its entry. Each guard keeps at
+    most ``max_entries_per_guard`` entries (the most recent), and expired
+    entries are deleted at most once per ``_PRUNE_INTERVAL`` seconds.
+    """
+
+    _PRUNE_INTERVAL = 3600
+
+    def __init__(
+        self,
+        embedding_model: str,
+        threshold: float,
+        ttl_seconds: Optional[int] = None,
+        max_entries_per_guard: Optional[int] = None,
+    ) -> None:
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_guard = max_entries_per_guard
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+        # A miss embeds the text in lookup() and again in store(); memoize so
+        # that costs one embedding call. Failures raise and are not memoized.
+        self._embed_cached = lru_cache(maxsize=256)(self._request_embedding)
+
+    def _request_embedding(self, text: str) -> array:
+        from src.services.gemini_client import _genai_client
+
+        client = _genai_client(os.environ["GEMINI_API_KEY"])
+        with gemini_limiter.permit():
+            result = client.models.embed_content(model=self.embedding_model, contents=text)
+        return _normalize(result.embeddings[0].values)
+
+    def _embed(self, text: str) -> Optional[array]:
+        """Return the normalized embedding of ``text``, or None if unavailable."""
+        try:
+            return self._embed_cached(text)
+        except Exception:
+            # The cache is an optimization; never fail a request because of it
+            return None
+
+    def _candidates(self, namespace: str, guard: str) -> List[tuple]:
+        query = "SELECT rowid, embedding FROM semantic_cache WHERE namespace = ? AND guard = ?"
+        params: tuple = (namespace, guard)
+        if self.ttl_seconds is not None:
+            query += " AND created_at >= ?"
+            params += (int(time.time()) - self.ttl_seconds,)
+        return get_connection().execute(query, params).fetchall()
+
+    def lookup(self, namespace: str, text: str, guard: str) -> Optional[SemanticHit]:
+        """Return the cached response most similar to ``text``, or None.
+
+        Parameters
+        ----------
+        namespace: str
+            Kind of response cached (e.g. the output schema name).
+        text: str
+            Canonical request string to embed.
+        guard: str
+            Fields that must match exactly for an entry to be considered.
+
+        Returns
+        -------
+        Optional[SemanticHit]
+            Response text and cosine similarity of the best entry at or
+            above ``threshold``.
+        """
+        best_score, best_rowid = -1.0, None
+        rows = self._candidates(namespace, guard)
+        if rows:
+            query = self._embed(text)
+            if query is not None:
+                for rowid, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    score = sum(map(mul, query, vector))
+                    if score > best_score:
+                        best_score, best_rowid = score, rowid
+
+        # Only the winning entry's response is read
+        response = None
+        if best_rowid is not None and best_score >= self.threshold:
+            row = get_connection().execute(
+                "SELECT response FROM semantic_cache WHERE rowid = ?", (best_rowid,)
+            ).fetchone()
+            response = row[0] if row is not None else None
+        with self._lock:
+            if response is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        # float32 rounding can put identical texts a hair above 1
+        return SemanticHit(response, min(best_score, 1.0)) if response is not None else None
+
+    def _prune_expired(self, conn, now: int) -> None:
+        if self.ttl_seconds is None:
+            return
+        with self._lock:
+            if now - self._last_prune < self._PRUNE_INTERVAL:
+                return
+            self._last_prune = now
+        conn.execute("DELETE FROM semantic_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def store(self, namespace: str, text: str, guard: str, response: str) -> None:
+        """Embed ``text`` and cache ``response`` under it (skipped if embedding fails).
+
+        An entry already stored for the same text is replaced; the oldest
+        entries beyond ``max_entries_per_guard`` are evicted.
+        """
+        vector = self._embed(text)
+        if vector is None:
+            return
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        now = int(time.time())
+        with transaction() as conn:
+            conn.execute(
+                "INSERT INTO semantic_cache "
+                "(namespace, guard, text_hash, embedding, response, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (namespace, guard, text_hash) DO UPDATE SET "
+                "embedding = excluded.embedding, response = excluded.response, "
+                "created_at = excluded.created_at",
+                (namespace, guard, text_hash, vector.tobytes(), response, now),
+            )
+            if self.max_entries_per_guard is not None:
+                conn.execute(
+                    "DELETE FROM semantic_cache WHERE namespace = ? AND guard = ? AND rowid NOT IN ("
+                    "SELECT rowid FROM semantic_cache WHERE namespace = ? AND guard = ? "
+                    "ORDER BY created_at DESC, rowid DESC LIMIT ?)",
+                    (namespace, guard, namespace, guard, self.max_entries_per_guard),
+                )
+            self._prune_expired(conn, now)
+
+
+# Process-wide semantic cache shared by the insights services.
+semantic_cache = SemanticCache(**SEMANTIC_CACHE_CONFIG)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent identical async calls into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    with the same key while it is in flight await that task instead of
+    starting their own. The task is shielded, so one caller disconnecting
+    does not cancel the work for the others. Keys are forgotten once the
+    work finishes, so later calls run again (and hit any persistent cache).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Task[T]] = {}
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
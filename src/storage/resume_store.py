@@ -1,220 +1,599 @@
 from __future__ import annotations
 
 import hashlib
-import json
-import os
+import sqlite3
+import threading
 import uuid
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Union
+
+import orjson
 
 from src.models.resume import Resume
+from src.storage.sqlite_store import get_connection, transaction
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]
+# Legacy per-resume JSON files; imported into SQLite the first time an ID is requested.
 PARSED_DIR = BASE_DIR / "data" / "resumes" / "parsed"
 
+# In-memory LRU of parsed resume bodies: resume_id -> data. Bodies never change
+# after extraction (scores and insights live in separate tables), so entries
+# never go stale.
+RESUME_CACHE_SIZE = 512
+_RESUME_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_RESUME_CACHE_LOCK = threading.Lock()
+
+# LRU of merged views (body + scores + insights) returned by load_parsed_resume.
+# The save_* functions below are the only writers of those tables, and each
+# applies its write to the cached view (see _patching_view). The generation
+# counter stops a view read during a concurrent write from being cached after it.
+_VIEW_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_view_generation = 0
+
+# IDs per query in load_parsed_resumes (below SQLite's bound-parameter limit).
+LOAD_BATCH_SIZE = 500
+
+# Near-duplicate job descriptions may opt in to sharing cached ATS scores: shingle hashes kept
+# per description, and the estimated Jaccard similarity needed for a match.
+JD_SKETCH_SIZE = 128
+JD_SIMILARITY_THRESHOLD = 0.9
+
+
+def _cache_put(resume_id: str, data: Dict[str, Any]) -> None:
+    with _RESUME_CACHE_LOCK:
+        _RESUME_CACHE[resume_id] = data
+        _RESUME_CACHE.move_to_end(resume_id)
+        while len(_RESUME_CACHE) > RESUME_CACHE_SIZE:
+            _RESUME_CACHE.popitem(last=False)
+
+
+def _view_put(resume_id: str, data: Dict[str, Any], generation: Optional[int] = None) -> None:
+    """Cache a merged view, unless a write happened since ``generation`` was read."""
+    with _RESUME_CACHE_LOCK:
+        if generation is None or generation == _view_generation:
+            _VIEW_CACHE[resume_id] = data
+            _VIEW_CACHE.move_to_end(resume_id)
+            while len(_VIEW_CACHE) > RESUME_CACHE_SIZE:
+                _VIEW_CACHE.popitem(last=False)
+
+
+@contextmanager
+def _patching_view(resume_id: str, key: str, update: Callable[[Any], Any]) -> Iterator[None]:
+    """Apply the score or insight written inside the block to the cached view.
+
+    ``update`` receives the view's current ``key`` value (None if absent)
+    and returns its replacement, building new containers instead of
+    mutating the shared ones. Readers then keep the view rather than
+    re-reading every score and insight after each write.
+
+    Only a view cached before the write started is patched. Readers racing
+    the write cannot cache their view once the block ends, and a view
+    cached by anyone else meanwhile (which may already hold the new entry)
+    is dropped instead of patched, so no entry is applied twice.
+    """
+    global _view_generation
+    with _RESUME_CACHE_LOCK:
+        _view_generation += 1
+        before = _VIEW_CACHE.get(resume_id)
+    yield
+    with _RESUME_CACHE_LOCK:
+        _view_generation += 1
+        view = _VIEW_CACHE.get(resume_id)
+        if view is None:
+            return
+        if view is before:
+            patched = dict(view)
+            patched[key] = update(view.get(key))
+            _VIEW_CACHE[resume_id] = patched
+        else:
+            del _VIEW_CACHE[resume_id]
+
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    return orjson.loads(data)
+
+
+def _embed_json(data: Union[Dict[str, Any], str]) -> Any:
+    """Wrap already serialized JSON so _dumps embeds it without re-encoding."""
+    return orjson.Fragment(data) if isinstance(data, str) else data
+
+
+def _import_legacy_json(resume_id: str) -> bool:
+    """Import ``PARSED_DIR/<resume_id>.json`` into the database, if it exists."""
+    path = PARSED_DIR / f"{resume_id}.json"
+    try:
+        data = _loads(path.read_bytes())
+    except FileNotFoundError:
+        return False
+
+    ats_scores = data.pop("ats_scores", {})
+    salary_insights = data.pop("salary_insights", [])
+    upskilling_reports = data.pop("upskilling_reports", [])
+    with transaction() as tx:
+        if tx.execute("SELECT 1 FROM resumes WHERE id = ?", (resume_id,)).fetchone():
+            return True  # imported concurrently by another thread
+        tx.execute("INSERT INTO resumes (id, data) VALUES (?, ?)", (resume_id, _dumps(data)))
+        tx.executemany(
+            "INSERT INTO ats_scores (resume_id, jd_hash, entry) VALUES (?, ?, ?)",
+            [(resume_id, job_hash, _dumps(entry)) for job_hash, entry in ats_scores.items()],
+        )
+        tx.executemany(
+            "INSERT INTO salary_insights (resume_id, entry) VALUES (?, ?)",
+            [(resume_id, _dumps(entry)) for entry in salary_insights],
+        )
+        tx.executemany(
+            "INSERT INTO upskilling_reports (resume_id, entry) VALUES (?, ?)",
+            [(resume_id, _dumps(entry)) for entry in upskilling_reports],
+        )
+    return True
+
+
+def _load_resume_body(resume_id: str) -> Optional[Dict[str, Any]]:
+    """Return the stored resume body (without scores/insights), or None."""
+    with _RESUME_CACHE_LOCK:
+        cached = _RESUME_CACHE.get(resume_id)
+        if cached is not None:
+            _RESUME_CACHE.move_to_end(resume_id)
+            return cached
+
+    conn = get_connection()
+    row = conn.execute("SELECT data FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+    if row is None:
+        if not _import_legacy_json(resume_id):
+            return None
+        row = conn.execute("SELECT data FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+
+    data = _loads(row[0])
+    _cache_put(resume_id, data)
+    return data
 
-def ensure_storage_dirs() -> None:
-    PARSED_DIR.mkdir(parents=True, exist_ok=True)
 
+def load_resume_body(resume_id: str) -> Dict[str, Any]:
+    """Load the stored resume fields only, without scores or insights.
 
-def save_parsed_resume(resume: Resume) -> str:
-    """Persist the structured resume JSON and return its generated ID."""
-    ensure_storage_dirs()
+    Unlike :func:`load_parsed_resume`, the result never changes for a given
+    ID. It is shared between callers and must not be mutated.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no resume with the given ID exists.
+    """
+    body = _load_resume_body(resume_id)
+    if body is None:
+        raise FileNotFoundError(f"No stored resume with id {resume_id}")
+    return body
+
+
+def _require_resume(resume_id: str) -> None:
+    if _load_resume_body(resume_id) is None:
+        raise FileNotFoundError(f"No stored resume with id {resume_id}")
+
+
+def save_parsed_resume(resume: Resume, content_hash: Optional[str] = None) -> str:
+    """Persist the structured resume JSON and return its generated ID.
+
+    If ``content_hash`` (digest of the uploaded file bytes) is given, it is
+    indexed so :func:`find_by_content_hash` can return this ID for re-uploads.
+    """
     resume_id = str(uuid.uuid4())
-    output_path = PARSED_DIR / f"{resume_id}.json"
+    resume_data = resume.model_dump(mode="json")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(resume.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT INTO resumes (id, content_hash, data) VALUES (?, ?, ?)",
+            (resume_id, content_hash, _dumps(resume_data)),
+        )
+    except sqlite3.IntegrityError:
+        # Same content saved concurrently; keep the first parse as canonical
+        # for dedup and store this one unindexed.
+        conn.execute(
+            "INSERT INTO resumes (id, data) VALUES (?, ?)",
+            (resume_id, _dumps(resume_data)),
+        )
+    _cache_put(resume_id, resume_data)
+    # A new resume has no scores or insights yet, so its body is its full view
+    _view_put(resume_id, resume_data)
 
     return resume_id
 
 
+def find_by_content_hash(content_hash: str) -> Optional[str]:
+    """Return the ID of a resume previously parsed from identical file bytes.
+
+    Parameters
+    ----------
+    content_hash: str
+        Hex digest of the uploaded file bytes.
+
+    Returns
+    -------
+    Optional[str]
+        Stored resume ID if the content was seen before, None otherwise.
+    """
+    row = get_connection().execute(
+        "SELECT id FROM resumes WHERE content_hash = ?", (content_hash,)
+    ).fetchone()
+    return row[0] if row else None
+
+
 def load_parsed_resume(resume_id: str) -> Dict[str, Any]:
-    """Load previously stored structured resume JSON by ID."""
-    path = PARSED_DIR / f"{resume_id}.json"
-    if not path.exists():
+    """Load previously stored structured resume JSON by ID.
+
+    The result has the same shape as the original per-resume JSON file:
+    the resume fields plus ``ats_scores``, ``salary_insights`` and
+    ``upskilling_reports`` when any have been saved. Results are served from
+    an in-memory cache that the save functions keep up to date; a fresh
+    top-level dict is returned on every call, but nested values are shared
+    and must not be mutated.
+    """
+    with _RESUME_CACHE_LOCK:
+        view = _VIEW_CACHE.get(resume_id)
+        if view is not None:
+            _VIEW_CACHE.move_to_end(resume_id)
+            return dict(view)
+        generation = _view_generation
+
+    body = _load_resume_body(resume_id)
+    if body is None:
         raise FileNotFoundError(f"No stored resume with id {resume_id}")
 
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    data = dict(body)
+    conn = get_connection()
+
+    ats_rows = conn.execute(
+        "SELECT jd_hash, entry FROM ats_scores WHERE resume_id = ?", (resume_id,)
+    ).fetchall()
+    if ats_rows:
+        data["ats_scores"] = {job_hash: _loads(entry) for job_hash, entry in ats_rows}
+
+    for table in ("salary_insights", "upskilling_reports"):
+        rows = conn.execute(
+            f"SELECT entry FROM {table} WHERE resume_id = ? ORDER BY seq", (resume_id,)
+        ).fetchall()
+        if rows:
+            data[table] = [_loads(entry) for (entry,) in rows]
+
+    _view_put(resume_id, data, generation)
+    return dict(data)
 
 
-def _hash_job_description(job_description: str) -> str:
-    """Generate a stable hash for job description to use as cache key."""
-    return hashlib.sha256(job_description.strip().encode("utf-8")).hexdigest()[:32]
+def load_parsed_resumes(resume_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Load several stored resumes, with one query per table for cache misses.
 
-def get_cached_ats_score(resume_id: str, job_description: str) -> Optional[Dict[str, Any]]:
+    Each value has the shape returned by :func:`load_parsed_resume`. IDs that
+    are not stored are left out of the result instead of raising.
+    """
+    views: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    with _RESUME_CACHE_LOCK:
+        for resume_id in dict.fromkeys(resume_ids):
+            view = _VIEW_CACHE.get(resume_id)
+            if view is not None:
+                _VIEW_CACHE.move_to_end(resume_id)
+                views[resume_id] = dict(view)
+            else:
+                missing.append(resume_id)
+        generation = _view_generation
+
+    conn = get_connection()
+    for start in range(0, len(missing), LOAD_BATCH_SIZE):
+        batch = missing[start:start + LOAD_BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+
+        bodies = {
+            resume_id: _loads(data)
+            for resume_id, data in conn.execute(
+                f"SELECT id, data FROM resumes WHERE id IN ({placeholders})", batch
+            )
+        }
+        for resume_id in batch:
+            if resume_id in bodies:
+                _cache_put(resume_id, bodies[resume_id])
+            else:
+                # Legacy JSON resumes are imported one at a time
+                body = _load_resume_body(resume_id)
+                if body is not None:
+                    bodies[resume_id] = body
+        merged = {resume_id: dict(body) for resume_id, body in bodies.items()}
+
+        for resume_id, job_hash, entry in conn.execute(
+            f"SELECT resume_id, jd_hash, entry FROM ats_scores WHERE resume_id IN ({placeholders})",
+            batch,
+        ):
+            merged[resume_id].setdefault("ats_scores", {})[job_hash] = _loads(entry)
+
+        for table in ("salary_insights", "upskilling_reports"):
+            for resume_id, entry in conn.execute(
+                f"SELECT resume_id, entry FROM {table} WHERE resume_id IN ({placeholders}) "
+                "ORDER BY seq",
+                batch,
+            ):
+                merged[resume_id].setdefault(table, []).append(_loads(entry))
+
+        for resume_id, data in merged.items():
+            _view_put(resume_id, data, generation)
+            views[resume_id] = dict(data)
+
+    return {resume_id: views[resume_id] for resume_id in resume_ids if resume_id in views}
+
+
+@lru_cache(maxsize=256)
+def hash_job_description(job_description: str) -> str:
+    """Generate a stable hash for job description to use as cache key.
+
+    The text is lowercased and whitespace-collapsed first, so formatting-only
+    differences between otherwise identical job descriptions share a key.
+    Results are memoized: a request hashes its job description more than
+    once (request coalescing, scoring, storage).
+    """
+    normalized = " ".join(job_description.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).digest()[:16].hex()
+
+
+def _legacy_hash_job_description(job_description: str) -> str:
+    """Cache key used before normalization was introduced (read-only fallback)."""
+    return hashlib.sha256(job_description.strip().encode("utf-8")).digest()[:16].hex()
+
+
+def _jd_sketch(job_description: str) -> array:
+    """Bottom-k MinHash sketch of a job description's word 3-gram shingles.
+
+    Holds the ``JD_SKETCH_SIZE`` smallest 64-bit shingle hashes, sorted.
+    Two sketches estimate the Jaccard similarity of their shingle sets
+    (see :func:`_sketch_similarity`) without keeping the texts.
+    """
+    words = job_description.lower().split()
+    shingles = {" ".join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))}
+    hashes = (
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    )
+    return array("Q", sorted(hashes)[:JD_SKETCH_SIZE])
+
+
+def _sketch_similarity(a: array, b: array) -> float:
+    """Estimate the Jaccard similarity of two :func:`_jd_sketch` sketches."""
+    union = sorted(set(a).union(b))[:JD_SKETCH_SIZE]
+    if not union:
+        return 0.0
+    common = set(a).intersection(b)
+    return sum(1 for h in union if h in common) / len(union)
+
+
+def _similar_ats_score(resume_id: str, job_description: str) -> Optional[Dict[str, Any]]:
+    """Return the cached score of a near-duplicate job description, if any.
+
+    The returned entry carries a ``near_duplicate`` item with the matched
+    ``job_description_hash`` and the estimated ``similarity``.
+    """
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT jd_hash, sketch FROM ats_sketches WHERE resume_id = ?", (resume_id,)
+    ).fetchall()
+    if not rows:
+        return None
+
+    sketch = _jd_sketch(job_description)
+    best_score, best_hash = 0.0, None
+    for job_hash, blob in rows:
+        stored = array("Q")
+        stored.frombytes(blob)
+        score = _sketch_similarity(sketch, stored)
+        if score > best_score:
+            best_score, best_hash = score, job_hash
+    if best_score < JD_SIMILARITY_THRESHOLD:
+        return None
+
+    # Only the matched entry is read and parsed
+    row = conn.execute(
+        "SELECT entry FROM ats_scores WHERE resume_id = ? AND jd_hash = ?",
+        (resume_id, best_hash),
+    ).fetchone()
+    if row is None:
+        return None
+    entry = _loads(row[0])
+    entry["near_duplicate"] = {"job_description_hash": best_hash, "similarity": best_score}
+    return entry
+
+
+def get_cached_ats_score(
+    resume_id: str,
+    job_description: str,
+    job_hash: Optional[str] = None,
+    near_duplicates: bool = False,
+) -> Optional[Dict[str, Any]]:
     """Retrieve cached ATS score for a resume-job combination.
-    
+
+    Without an exact match, and only if ``near_duplicates`` is set, the
+    score of a job description whose shingles overlap by
+    ``JD_SIMILARITY_THRESHOLD`` (estimated Jaccard similarity) is returned
+    instead, marked with a ``near_duplicate`` item. Word shingles cannot
+    tell a changed key skill from a reworded sentence, so this is opt-in.
+
     Parameters
     ----------
     resume_id: str
         UUID of the stored resume.
     job_description: str
         Job description text.
-    
+    job_hash: Optional[str]
+        Precomputed :func:`hash_job_description` of ``job_description``.
+    near_duplicates: bool
+        Whether to fall back to scores of near-duplicate job descriptions.
+
     Returns
     -------
     Optional[Dict[str, Any]]
-        Cached ATS score if found, None otherwise.
+        Cached ATS score if found, None otherwise. The entry may be shared
+        with the resume view cache and must not be mutated.
     """
-    path = PARSED_DIR / f"{resume_id}.json"
-    if not path.exists():
+    job_hash = job_hash or hash_job_description(job_description)
+    entry = _exact_ats_score(resume_id, job_description, job_hash)
+    if entry is None and near_duplicates:
+        entry = _similar_ats_score(resume_id, job_description)
+    return entry
+
+
+def _exact_ats_score(
+    resume_id: str, job_description: str, job_hash: str
+) -> Optional[Dict[str, Any]]:
+    """Return the cached score stored under exactly this job description, or None."""
+    # A cached view holds every score of the resume, so hits and misses
+    # alike are answered without touching the database
+    with _RESUME_CACHE_LOCK:
+        view = _VIEW_CACHE.get(resume_id)
+    if view is not None:
+        scores = view.get("ats_scores") or {}
+        entry = scores.get(job_hash)
+        if entry is None and scores:
+            entry = scores.get(_legacy_hash_job_description(job_description))
+        return entry
+
+    # Ensures a legacy JSON resume (and its cached scores) has been imported
+    if _load_resume_body(resume_id) is None:
         return None
-    
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Check if ats_scores field exists
-    ats_scores = data.get("ats_scores", {})
-    job_hash = _hash_job_description(job_description)
-    
-    return ats_scores.get(job_hash)
 
+    conn = get_connection()
+    query = "SELECT entry FROM ats_scores WHERE resume_id = ? AND jd_hash = ?"
+    row = conn.execute(query, (resume_id, job_hash)).fetchone()
+    if row is None:
+        # Scores saved before normalization; hashed only when the current key misses
+        legacy_hash = _legacy_hash_job_description(job_description)
+        row = conn.execute(query, (resume_id, legacy_hash)).fetchone()
+    return _loads(row[0]) if row else None
 
-import tempfile
 
 def save_ats_score(
     resume_id: str,
     job_description: str,
-    ats_score: Dict[str, Any],
+    ats_score: Union[Dict[str, Any], str],
+    job_hash: Optional[str] = None,
+    schema_version: Optional[int] = None,
 ) -> None:
-    """Save ATS score to resume JSON file for caching.
-    
+    """Save ATS score for a resume-job combination for caching.
+
     Parameters
     ----------
     resume_id: str
         UUID of the stored resume.
     job_description: str
         Job description text used for scoring.
-    ats_score: Dict[str, Any]
-        ATS score data to cache.
+    ats_score: Dict[str, Any] | str
+        ATS score data to cache, or its JSON text (e.g. ``model_dump_json()``).
+    job_hash: Optional[str]
+        Precomputed :func:`hash_job_description` of ``job_description``.
+    schema_version: Optional[int]
+        Version of the schema ``ats_score`` was validated against, stored so
+        readers can trust entries written by the current schema.
     """
-    path = PARSED_DIR / f"{resume_id}.json"
-    if not path.exists():
-        raise FileNotFoundError(f"No stored resume with id {resume_id}")
-    
-    # Load existing data
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Initialize ats_scores if not present
-    if "ats_scores" not in data:
-        data["ats_scores"] = {}
-    
+    _require_resume(resume_id)
+
     # Add new score with job description hash as key
-    job_hash = _hash_job_description(job_description)
-    data["ats_scores"][job_hash] = {
+    job_hash = job_hash or hash_job_description(job_description)
+    entry = {
         "job_description_hash": job_hash,
         "job_description_preview": job_description[:200] + "..." if len(job_description) > 200 else job_description,
-        "score": ats_score,
+        "score": _embed_json(ats_score),
     }
-    
-    # Atomic write: write to temp file, then rename
-    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp_path, path)
-    except:
-        os.unlink(tmp_path)
-        raise
+    if schema_version is not None:
+        entry["schema_version"] = schema_version
+
+    serialized = _dumps(entry)
+    sketch = _jd_sketch(job_description).tobytes()
+    # Parsed back only if a cached view needs the entry
+    patch = _patching_view(
+        resume_id, "ats_scores", lambda scores: {**(scores or {}), job_hash: _loads(serialized)}
+    )
+    with patch, transaction() as tx:
+        tx.execute(
+            "INSERT INTO ats_scores (resume_id, jd_hash, entry) VALUES (?, ?, ?) "
+            "ON CONFLICT (resume_id, jd_hash) DO UPDATE SET entry = excluded.entry",
+            (resume_id, job_hash, serialized),
+        )
+        tx.execute(
+            "INSERT OR REPLACE INTO ats_sketches (resume_id, jd_hash, sketch) VALUES (?, ?, ?)",
+            (resume_id, job_hash, sketch),
+        )
 
 
 def save_salary_insights(
     resume_id: str,
-    salary_data: Dict[str, Any],
+    salary_data: Union[Dict[str, Any], str],
     job_title: str,
     location: str,
 ) -> None:
-    """Save salary insights to resume JSON file.
-    
+    """Save salary insights for a stored resume.
+
     Parameters
     ----------
     resume_id: str
         UUID of the stored resume.
-    salary_data: Dict[str, Any]
-        Salary recommendation data.
+    salary_data: Dict[str, Any] | str
+        Salary recommendation data, or its JSON text.
     job_title: str
         Job title researched.
     location: str
         Location researched.
     """
-    path = PARSED_DIR / f"{resume_id}.json"
-    if not path.exists():
-        raise FileNotFoundError(f"No stored resume with id {resume_id}")
-    
-    # Load existing data
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Initialize salary_insights if not present
-    if "salary_insights" not in data:
-        data["salary_insights"] = []
-    
+    _require_resume(resume_id)
+
     # Add new salary insight with metadata
     insight = {
         "job_title": job_title,
         "location": location,
         "timestamp": str(uuid.uuid4()),  # Using uuid as timestamp placeholder
-        "data": salary_data,
+        "data": _embed_json(salary_data),
     }
-    data["salary_insights"].append(insight)
-    
-    # Atomic write
-    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp_path, path)
-    except:
-        os.unlink(tmp_path)
-        raise
+    serialized = _dumps(insight)
+    with _patching_view(
+        resume_id, "salary_insights", lambda entries: [*(entries or []), _loads(serialized)]
+    ):
+        get_connection().execute(
+            "INSERT INTO salary_insights (resume_id, entry) VALUES (?, ?)",
+            (resume_id, serialized),
+        )
 
 
 def save_upskilling_report(
     resume_id: str,
-    upskilling_data: Dict[str, Any],
+    upskilling_data: Union[Dict[str, Any], str],
     target_role: str,
 ) -> None:
-    """Save upskilling report to resume JSON file.
-    
+    """Save upskilling report for a stored resume.
+
     Parameters
     ----------
     resume_id: str
         UUID of the stored resume.
-    upskilling_data: Dict[str, Any]
-        Upskilling report data.
+    upskilling_data: Dict[str, Any] | str
+        Upskilling report data, or its JSON text.
     target_role: str
         Target role for upskilling.
     """
-    path = PARSED_DIR / f"{resume_id}.json"
-    if not path.exists():
-        raise FileNotFoundError(f"No stored resume with id {resume_id}")
-    
-    # Load existing data
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    # Initialize upskilling_reports if not present
-    if "upskilling_reports" not in data:
-        data["upskilling_reports"] = []
-    
+    _require_resume(resume_id)
+
     # Add new upskilling report
     report = {
         "target_role": target_role,
         "timestamp": str(uuid.uuid4()),
-        "data": upskilling_data,
+        "data": _embed_json(upskilling_data),
     }
-    data["upskilling_reports"].append(report)
-    
-    # Atomic write
-    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp_path, path)
-    except:
-        os.unlink(tmp_path)
-        raise
\ No newline at end of file
+    serialized = _dumps(report)
+    with _patching_view(
+        resume_id, "upskilling_reports", lambda entries: [*(entries or []), _loads(serialized)]
+    ):
+        get_connection().execute(
+            "INSERT INTO upskilling_reports (resume_id, entry) VALUES (?, ?)",
+            (resume_id, serialized),
+        )
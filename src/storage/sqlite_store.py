@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DB_PATH = BASE_DIR / "data" / "resumes" / "resumes.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id TEXT PRIMARY KEY,
+    content_hash TEXT UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ats_scores (
+    resume_id TEXT NOT NULL REFERENCES resumes(id),
+    jd_hash TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    PRIMARY KEY (resume_id, jd_hash)
+);
+CREATE TABLE IF NOT EXISTS ats_sketches (
+    resume_id TEXT NOT NULL REFERENCES resumes(id),
+    jd_hash TEXT NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (resume_id, jd_hash)
+);
+CREATE TABLE IF NOT EXISTS salary_insights (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id TEXT NOT NULL REFERENCES resumes(id),
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_salary_insights_resume ON salary_insights(resume_id);
+CREATE TABLE IF NOT EXISTS upskilling_reports (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id TEXT NOT NULL REFERENCES resumes(id),
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_upskilling_reports_resume ON upskilling_reports(resume_id);
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);
+CREATE TABLE IF NOT EXISTS semantic_cache (
+    namespace TEXT NOT NULL,
+    guard TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    response TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    PRIMARY KEY (namespace, guard, text_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_semantic_cache_created ON semantic_cache(created_at);
+"""
+
+# One connection per thread (blocking store calls run in a threadpool), keyed
+# by database path so a changed DB_PATH never reuses a stale connection.
+_local = threading.local()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's connection to :data:`DB_PATH`, creating it if needed.
+
+    Connections run in autocommit mode with WAL journaling; use
+    :func:`transaction` for multi-statement writes.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    path = Path(DB_PATH)
+    conn = connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        connections[path] = conn
+    return conn
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run the enclosed statements in a single write transaction."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
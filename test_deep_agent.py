@@ -3,6 +3,7 @@ Test script for optimized deep agent implementation.
 Validates structured outputs and performance.
 """
 
+import asyncio
 import os
 import time
 from src.services.insights_service import InsightsService
@@ -21,24 +22,35 @@ service = InsightsService()
 init_time = time.time() - start
 print(f"✅ Service initialized in {init_time:.2f}s")
 
-# Test salary recommendation
-print("\n2️⃣ Testing Salary Recommendation with Structured Output...")
+# Generate both insights concurrently (independent LLM round-trips)
+print("\n2️⃣ Generating Salary and Upskilling Insights Concurrently...")
 print("-" * 60)
 
 test_resume_id = "0407ed11-4f8f-4f35-89f6-a794ae2653d8"
 
 try:
     start = time.time()
-    salary = service.get_salary_recommendation(
+    salary, upskilling = asyncio.run(service.get_all_insights(
         resume_id=test_resume_id,
         job_title="Senior AI/ML Engineer",
         location="San Francisco, CA",
-        experience_years=5
-    )
+        experience_years=5,
+        target_role="Lead AI Architect"
+    ))
     response_time = time.time() - start
     
-    print(f"✅ Salary research completed in {response_time:.2f}s")
-    print(f"\n📊 Results:")
+    print(f"✅ Both insights completed in {response_time:.2f}s")
+    
+except Exception as e:
+    print(f"❌ Insights generation failed: {e}")
+    raise
+
+# Test salary recommendation
+print("\n3️⃣ Testing Salary Recommendation with Structured Output...")
+print("-" * 60)
+
+try:
+    print(f"📊 Results:")
     print(f"   Range: ${salary.recommended_range.min_salary:,} - ${salary.recommended_range.max_salary:,}")
     print(f"   Median: ${salary.market_median:,}")
     print(f"   25th: ${salary.percentile_25:,}")
@@ -54,7 +66,7 @@ try:
     # Validate Pydantic model
     print(f"\n✅ Pydantic validation: PASSED")
     print(f"   Model type: {type(salary).__name__}")
-    print(f"   All fields present: {all([
+    fields_ok = all((
         salary.recommended_range,
         salary.market_median,
         salary.percentile_25,
@@ -63,26 +75,19 @@ try:
         salary.market_trends,
         salary.sources,
         salary.analysis_summary
-    ])}")
+    ))
+    print(f"   All fields present: {fields_ok}")
     
 except Exception as e:
     print(f"❌ Salary recommendation failed: {e}")
     raise
 
 # Test upskilling recommendations
-print("\n3️⃣ Testing Upskilling Recommendations with Structured Output...")
+print("\n4️⃣ Testing Upskilling Recommendations with Structured Output...")
 print("-" * 60)
 
 try:
-    start = time.time()
-    upskilling = service.get_upskilling_recommendations(
-        resume_id=test_resume_id,
-        target_role="Lead AI Architect"
-    )
-    response_time = time.time() - start
-    
-    print(f"✅ Upskilling analysis completed in {response_time:.2f}s")
-    print(f"\n📚 Results:")
+    print(f"📚 Results:")
     print(f"   Identified Gaps: {len(upskilling.identified_gaps)}")
     print(f"   Target Skills: {len(upskilling.target_skills)}")
     print(f"   Learning Resources: {len(upskilling.all_resources)}")
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import pytest
+
+from src.storage import resume_store, sqlite_store
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the SQLite store at a fresh database and empty the resume caches."""
+    monkeypatch.setattr(sqlite_store, "DB_PATH", tmp_path / "resumes.db")
+    resume_store._RESUME_CACHE.clear()
+    resume_store._VIEW_CACHE.clear()
+    yield tmp_path / "resumes.db"
+    resume_store._RESUME_CACHE.clear()
+    resume_store._VIEW_CACHE.clear()
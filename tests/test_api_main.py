@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from src import api_main
+from src.api_main import ATSScoreRequest, _stream_snapshots
+from src.models.ats_score import ATSScore, SectionScore
+
+
+class _RecordingScorer:
+    """Stand-in ATSScorer recording the cache flags of each scoring run."""
+
+    def __init__(self) -> None:
+        self.calls: List[tuple] = []
+
+    def score(self, resume_id: str, job_description: str, use_cache: bool, near_duplicates: bool):
+        self.calls.append((use_cache, near_duplicates))
+        time.sleep(0.05)
+        return ATSScore(overall_score=50, section_scores=SectionScore())
+
+
+def test_ats_requests_coalesce_only_with_the_same_cache_flags(monkeypatch):
+    scorer = _RecordingScorer()
+    monkeypatch.setattr(api_main, "get_ats_scorer", lambda: scorer)
+
+    def request(**flags) -> ATSScoreRequest:
+        return ATSScoreRequest(resume_id="r1", job_description="Python engineer", **flags)
+
+    async def main():
+        await asyncio.gather(
+            api_main.score_resume_ats(request()),
+            api_main.score_resume_ats(request()),
+            api_main.score_resume_ats(request(use_cache=False)),
+            api_main.score_resume_ats(request(near_duplicates=True)),
+        )
+
+    asyncio.run(main())
+    assert sorted(scorer.calls) == [(False, False), (True, False), (True, True)]
+
+
+
+def test_upload_stream_is_the_iobase_behind_the_spool():
+    import io
+    import tempfile
+
+    from fastapi import UploadFile
+
+    for max_size in (1024, 4):  # in memory, then rolled over to disk
+        spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+        spool.write(b"resume bytes")
+        spool.seek(0)
+        stream = api_main._upload_stream(UploadFile(spool, filename="cv.pdf"))
+        assert stream is spool._file
+        assert isinstance(stream, io.IOBase)
+        assert stream.read() == b"resume bytes"
+
+
+def _collect(response, limit: int = None) -> List[bytes]:
+    async def main() -> List[bytes]:
+        lines = []
+        iterator = response.body_iterator
+        async for line in iterator:
+            lines.append(line)
+            if limit is not None and len(lines) == limit:
+                break
+        await iterator.aclose()
+        return lines
+
+    return asyncio.run(main())
+
+
+def test_stream_snapshots_reports_errors_as_a_final_line():
+    def snapshots() -> Iterator[ATSScore]:
+        yield ATSScore.model_construct(overall_score=10)
+        raise RuntimeError("boom")
+
+    lines = _collect(_stream_snapshots(snapshots))
+    assert lines[0].startswith(b'{"overall_score":10')
+    assert lines[-1] == b'{"status":"error","detail":"boom"}\n'
+
+
+def test_stream_snapshots_closes_the_generator_on_disconnect():
+    closed = threading.Event()
+    errors = []
+
+    def snapshots() -> Iterator[ATSScore]:
+        try:
+            for score in range(100):
+                time.sleep(0.01)
+                yield ATSScore.model_construct(overall_score=score)
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+            raise
+        finally:
+            closed.set()
+
+    lines = _collect(_stream_snapshots(snapshots), limit=2)
+    assert len(lines) == 2
+    assert closed.wait(timeout=2)
+    assert not [exc for exc in errors if not isinstance(exc, GeneratorExit)]
+
+
+class _FailingBatchClient:
+    """Stand-in GeminiClient whose batch call fails; one file fails alone too."""
+
+    def __init__(self) -> None:
+        self.batches: List[int] = []
+        self.singles: List[bytes] = []
+
+    def extract_resumes_batch(self, streams, schema, mime_types):
+        self.batches.append(len(streams))
+        raise RuntimeError("batch failed")
+
+    def extract_resume(self, stream, schema, mime_type):
+        stream.seek(0)
+        content = stream.read()
+        self.singles.append(content)
+        if content == b"bad":
+            raise RuntimeError("unreadable")
+        return schema(full_name=content.decode())
+
+
+def test_failed_upload_batch_falls_back_to_one_request_per_file(db, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    client = _FailingBatchClient()
+    monkeypatch.setattr(api_main, "get_gemini_client", lambda: client)
+    monkeypatch.setattr(api_main, "RESUME_BATCH_SIZE", 3)
+    uploads = [
+        ("files", (f"{name}.txt", name.encode(), "text/plain"))
+        for name in ("Ada", "bad", "Grace")
+    ]
+
+    response = TestClient(api_main.app).post("/resumes", files=uploads)
+
+    results = response.json()
+    assert [result["status"] for result in results] == ["success", "error", "success"]
+    assert "unreadable" in results[1]["detail"]
+    assert client.batches == [3]
+    assert sorted(client.singles) == [b"Ada", b"Grace", b"bad"]
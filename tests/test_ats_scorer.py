@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from pydantic import ValidationError
+
+from src.models.ats_score import ATS_SCORE_SCHEMA_VERSION, ATSScore, SectionScore
+from src.models.resume import Resume
+from src.services.ats_scorer import ATSScorer
+from src.storage import resume_store
+from src.storage.resume_store import load_parsed_resume, save_ats_score, save_parsed_resume
+
+
+JOB_DESCRIPTION = " ".join(f"requirement{i}" for i in range(200))
+# Out of range: only passes when the cached entry is trusted
+INVALID_SCORE = {"overall_score": 150, "section_scores": {"skills_match": 90}}
+
+
+class _FakeGeminiClient:
+    """Stand-in GeminiClient returning a fixed score and recording calls."""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    def score_resume_ats(self, resume_data, job_description, schema, use_cache, resume_id):
+        self.calls.append(resume_data)
+        return ATSScore(overall_score=70, section_scores=SectionScore(skills_match=60))
+
+
+@pytest.fixture
+def resume_id(db):
+    return save_parsed_resume(Resume(full_name="Ada", skills=["Python"]))
+
+
+@pytest.fixture
+def scorer():
+    return ATSScorer(gemini_client=_FakeGeminiClient())
+
+
+def test_fresh_scores_are_saved_and_then_served_from_cache(resume_id, scorer):
+    first = scorer.score(resume_id, JOB_DESCRIPTION)
+    assert len(scorer.client.calls) == 1
+    # The prompt gets the resume body, never its saved scores
+    assert "ats_scores" not in scorer.client.calls[0]
+
+    resume_store._VIEW_CACHE.clear()
+    again = scorer.score(resume_id, "  " + JOB_DESCRIPTION.upper())
+    assert again == first
+    assert again.approximate_match is None
+    assert len(scorer.client.calls) == 1
+
+    scorer.score(resume_id, JOB_DESCRIPTION, use_cache=False)
+    assert len(scorer.client.calls) == 2
+
+
+def test_near_duplicate_scores_are_opt_in_and_flagged(resume_id, scorer):
+    first = scorer.score(resume_id, JOB_DESCRIPTION)
+    edited = JOB_DESCRIPTION + " plus one more line"
+
+    reused = scorer.score(resume_id, edited, near_duplicates=True)
+    assert reused.overall_score == first.overall_score
+    assert reused.approximate_match.similarity >= resume_store.JD_SIMILARITY_THRESHOLD
+    assert len(scorer.client.calls) == 1
+    # Reused scores are not saved under the new job description
+    assert len(load_parsed_resume(resume_id)["ats_scores"]) == 1
+
+    scorer.score(resume_id, edited)
+    assert len(scorer.client.calls) == 2
+
+
+def test_blank_job_description_is_rejected(resume_id, scorer):
+    with pytest.raises(ValueError):
+        scorer.score(resume_id, "   ")
+    assert scorer.client.calls == []
+
+
+def test_current_schema_entries_are_trusted_unless_disabled(resume_id, scorer):
+    save_ats_score(
+        resume_id, JOB_DESCRIPTION, INVALID_SCORE, schema_version=ATS_SCORE_SCHEMA_VERSION
+    )
+
+    trusted = scorer.score(resume_id, JOB_DESCRIPTION)
+    assert trusted.overall_score == 150
+    assert isinstance(trusted.section_scores, SectionScore)
+    assert trusted.section_scores.skills_match == 90
+
+    with pytest.raises(ValidationError):
+        scorer.score(resume_id, JOB_DESCRIPTION, trust_cache=False)
+    assert scorer.client.calls == []
+
+
+@pytest.mark.parametrize("schema_version", [None, ATS_SCORE_SCHEMA_VERSION - 1])
+def test_other_schema_entries_are_always_validated(resume_id, scorer, schema_version):
+    save_ats_score(resume_id, JOB_DESCRIPTION, INVALID_SCORE, schema_version=schema_version)
+
+    with pytest.raises(ValidationError):
+        scorer.score(resume_id, JOB_DESCRIPTION)
+
+    valid = {"overall_score": 40, "section_scores": {}}
+    save_ats_score(resume_id, JOB_DESCRIPTION, valid, schema_version=schema_version)
+    assert scorer.score(resume_id, JOB_DESCRIPTION) == ATSScore.model_validate(valid)
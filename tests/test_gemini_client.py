@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+from src.services.gemini_client import _compile_template, _render_template
+
+
+ALLOWED = frozenset({"resume_json", "job_description"})
+
+
+def test_rendering_matches_str_format():
+    template = "Resume:\n{resume_json}\n\nJob ({job_description:>12}):\n{job_description}\n{{literal}}"
+    values = {"resume_json": '{"skills": []}', "job_description": "Data Engineer"}
+    assert _render_template(_compile_template(template, ALLOWED), **values) == template.format(**values)
+
+
+def test_templates_are_compiled_once():
+    template = "{resume_json} vs {job_description}"
+    assert _compile_template(template, ALLOWED) is _compile_template(template, ALLOWED)
+
+
+def test_unknown_placeholder_raises_key_error():
+    with pytest.raises(KeyError, match="salary"):
+        _compile_template("{resume_json} {salary}", ALLOWED)
+
+
+def test_conversions_are_rejected():
+    with pytest.raises(ValueError, match="!r"):
+        _compile_template("{resume_json!r}", ALLOWED)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Iterator, List, Optional
+
+import pytest
+
+from src.config.agent_config import UPSKILLING_AGENT_CONFIG
+from src.models.insights import SalaryRange, SalaryRecommendation, UpskillingReport
+from src.services import insights_service
+from src.services.insights_service import InsightsService, _partial_models
+from src.services.llm_cache import LLMCache
+from src.services.semantic_cache import SemanticHit
+
+
+RESUME = {
+    "skills": ["Python", "SQL"],
+    "experience": [{"job_title": "Data Engineer"}],
+    "contact": {"location": "Berlin, Germany"},
+}
+
+
+def _recommendation(summary: str) -> SalaryRecommendation:
+    return SalaryRecommendation(
+        recommended_range=SalaryRange(min_salary=60000, max_salary=80000),
+        market_median=70000,
+        percentile_25=62000,
+        percentile_75=78000,
+        analysis_summary=summary,
+    )
+
+
+def _report(summary: str) -> UpskillingReport:
+    return UpskillingReport(
+        estimated_total_duration="3 months",
+        career_impact="Senior roles",
+        report_summary=summary,
+    )
+
+
+class _FakeSemanticCache:
+    """Semantic cache returning a fixed hit and recording stores."""
+
+    def __init__(self, hit: Optional[SemanticHit] = None) -> None:
+        self.hit = hit
+        self.lookups = 0
+        self.stored: List[str] = []
+
+    def lookup(self, namespace, text, guard):
+        self.lookups += 1
+        return self.hit
+
+    def store(self, namespace, text, guard, response):
+        self.stored.append(response)
+
+
+class _FakeSalaryAgent:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def research_salary(self, **kwargs) -> SalaryRecommendation:
+        self.calls += 1
+        return _recommendation("researched")
+
+    async def aresearch_salary(self, **kwargs) -> SalaryRecommendation:
+        return self.research_salary(**kwargs)
+
+
+class _FakeUpskillingModel:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def invoke(self, messages) -> UpskillingReport:
+        self.calls += 1
+        return _report("generated")
+
+    async def ainvoke(self, messages) -> UpskillingReport:
+        return self.invoke(messages)
+
+
+@pytest.fixture
+def service(db, monkeypatch):
+    """InsightsService with a fake salary agent and fresh, fake caches."""
+    monkeypatch.setattr(insights_service, "llm_cache", LLMCache())
+    monkeypatch.setattr(insights_service, "semantic_cache", _FakeSemanticCache())
+    saved = []
+    monkeypatch.setattr(
+        insights_service, "save_salary_insights", lambda **kwargs: saved.append(kwargs)
+    )
+    monkeypatch.setattr(
+        insights_service, "save_upskilling_report", lambda **kwargs: saved.append(kwargs)
+    )
+    service = InsightsService()
+    service._salary_agent = _FakeSalaryAgent()
+    service._upskilling_runnable = _FakeUpskillingModel()
+    service.saved = saved
+    return service
+
+
+def test_salary_recommendations_are_cached(service):
+    first = service.get_salary_recommendation("r1", resume_data=RESUME)
+    second = asyncio.run(service.aget_salary_recommendation("r2", resume_data=RESUME))
+
+    assert second == first
+    assert service._salary_agent.calls == 1
+    # Only the fresh result is offered to the semantic cache; both are saved
+    assert len(insights_service.semantic_cache.stored) == 1
+    assert [entry["resume_id"] for entry in service.saved] == ["r1", "r2"]
+
+
+def test_upskilling_reports_are_cached_per_prompt(service):
+    first = asyncio.run(service.aget_upskilling_recommendations("r1", resume_data=RESUME))
+    again = service.get_upskilling_recommendations("r1", resume_data=RESUME)
+    other = service.get_upskilling_recommendations(
+        "r1", target_role="Staff Engineer", resume_data=RESUME
+    )
+
+    assert again == first
+    assert other.report_summary == "generated"
+    assert service._upskilling_runnable.calls == 2
+
+
+def test_semantic_hits_are_opt_in(service):
+    insights_service.semantic_cache.hit = SemanticHit(
+        _recommendation("similar").model_dump_json(), 0.95
+    )
+
+    result = service.get_salary_recommendation("r1", resume_data=RESUME)
+
+    assert result.analysis_summary == "researched"
+    assert result.approximate_match is None
+    assert insights_service.semantic_cache.lookups == 0
+    assert len(service.saved) == 1
+
+
+def test_semantic_hits_are_flagged_and_neither_promoted_nor_saved(service):
+    insights_service.semantic_cache.hit = SemanticHit(
+        _recommendation("similar").model_dump_json(), 0.95
+    )
+
+    result = service.get_salary_recommendation("r1", resume_data=RESUME, near_duplicates=True)
+
+    assert result.analysis_summary == "similar"
+    assert result.approximate_match.similarity == 0.95
+    assert service._salary_agent.calls == 0
+    assert service.saved == []
+    # The exact cache stays empty, so a plain request still researches
+    insights_service.semantic_cache.hit = None
+    again = service.get_salary_recommendation("r1", resume_data=RESUME)
+    assert again.analysis_summary == "researched"
+    assert again.approximate_match is None
+
+
+def test_salary_cache_key_is_built_from_the_agent_query():
+    pytest.importorskip("deepagents")
+    from src.config.agent_config import SALARY_AGENT_CONFIG
+    from src.services.deep_agent_salary import SalaryResearchAgent
+
+    request = InsightsService()._prepare_salary(RESUME, None, None, None)
+    query = SalaryResearchAgent.build_research_query(
+        request.job_title, request.location, request.experience_years, request.skills
+    )
+    assert request.cache_key == LLMCache.cache_key(
+        SALARY_AGENT_CONFIG["model"],
+        query,
+        SALARY_AGENT_CONFIG["temperature"],
+        SalaryRecommendation.__name__,
+    )
+
+
+def test_get_all_insights_cancels_the_other_request_on_failure(monkeypatch):
+    cancelled = []
+
+    async def failing_salary(*args, **kwargs):
+        await asyncio.sleep(0)
+        raise RuntimeError("salary failed")
+
+    async def slow_upskilling(*args, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setattr(insights_service, "load_parsed_resume", lambda resume_id: RESUME)
+    service = InsightsService()
+    monkeypatch.setattr(service, "aget_salary_recommendation", failing_salary)
+    monkeypatch.setattr(service, "aget_upskilling_recommendations", slow_upskilling)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="salary failed"):
+            await service.get_all_insights("r1")
+        # Already cancelled when the error propagates, not at loop shutdown
+        assert cancelled == [True]
+
+    asyncio.run(run())
+
+
+def test_partial_models_yield_growing_snapshots():
+    text = _report("streamed").model_dump_json()
+    chunks = [text[i:i + 40] for i in range(0, len(text), 40)]
+    snapshots = _partial_models(chunks, UpskillingReport)
+    seen = []
+    while True:
+        try:
+            seen.append(next(snapshots))
+        except StopIteration as stop:
+            assert stop.value == text
+            break
+    assert len(seen) > 1
+    assert seen[-1].report_summary == "streamed"
+
+
+class _FakeStreamClient:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.calls = 0
+
+    def stream_structured(self, prompt, schema, **kwargs) -> Iterator[str]:
+        self.calls += 1
+        return iter([self.text[i:i + 40] for i in range(0, len(self.text), 40)])
+
+
+def test_streamed_report_is_validated_cached_and_saved_once(service):
+    client = _FakeStreamClient(_report("streamed").model_dump_json())
+    service._stream_clients[UPSKILLING_AGENT_CONFIG["model"]] = client
+
+    snapshots = list(service.stream_upskilling_recommendations("r1", resume_data=RESUME))
+    assert len(snapshots) > 2
+    assert snapshots[-1] == _report("streamed")
+    assert len(service.saved) == 1
+
+    # A repeat is a single cached item
+    again = list(service.stream_upskilling_recommendations("r1", resume_data=RESUME))
+    assert again == [snapshots[-1]]
+    assert client.calls == 1
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+
+from src.services.llm_cache import LLMCache
+from src.storage.sqlite_store import get_connection
+
+
+def test_set_deletes_expired_rows(db):
+    cache = LLMCache(ttl_seconds=60)
+    cache.set("old", "v")
+    get_connection().execute("UPDATE llm_cache SET created_at = created_at - 120")
+    cache._last_prune = 0.0
+    cache.set("new", "v")
+    keys = [row[0] for row in get_connection().execute("SELECT key FROM llm_cache")]
+    assert keys == ["new"]
+
+
+def test_set_then_get(db):
+    cache = LLMCache()
+    assert cache.get("k") is None
+    cache.set("k", '{"a": 1}')
+    assert cache.get("k") == '{"a": 1}'
+    cache.set("k", '{"a": 2}')
+    assert cache.get("k") == '{"a": 2}'
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_entries_persist_across_instances(db):
+    LLMCache().set("k", "v")
+    assert LLMCache().get("k") == "v"
+
+
+def test_expired_entries_are_misses(db):
+    cache = LLMCache(ttl_seconds=60)
+    cache.set("k", "v")
+    get_connection().execute("UPDATE llm_cache SET created_at = created_at - 120")
+    assert cache.get("k") is None
+
+
+def test_cache_key_covers_every_input():
+    key = LLMCache.cache_key("model", "prompt", 0.2, "Schema")
+    assert key == LLMCache.cache_key("model", "prompt", 0.2, "Schema")
+    assert len({
+        key,
+        LLMCache.cache_key("other", "prompt", 0.2, "Schema"),
+        LLMCache.cache_key("model", "other", 0.2, "Schema"),
+        LLMCache.cache_key("model", "prompt", 0.0, "Schema"),
+        LLMCache.cache_key("model", "prompt", 0.2, "Other"),
+    }) == 5
+
+
+def test_expiry_applies_to_the_memory_tier(db, monkeypatch):
+    cache = LLMCache(ttl_seconds=60, memory_size=4)
+    cache.set("k", "v")
+    now = time.time()
+    monkeypatch.setattr("src.services.llm_cache.time.time", lambda: now + 120)
+    assert cache.get("k") is None
+
+
+def test_memory_tier_is_bounded_lru(db):
+    cache = LLMCache(memory_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert list(cache._memory) == ["a", "c"]
+    # Evicted entries are still served from SQLite
+    assert cache.get("b") == "2"
+
+
+def test_memory_hit_skips_sqlite(db):
+    cache = LLMCache(memory_size=2)
+    cache.set("k", "v")
+    get_connection().execute("DELETE FROM llm_cache")
+    assert cache.get("k") == "v"
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.services.rate_limiter import AdaptiveRateLimiter, _is_overload
+
+
+class _QuotaError(Exception):
+    code = 429
+
+
+def _peak_concurrency(limiter: AdaptiveRateLimiter, workers: int) -> int:
+    lock = threading.Lock()
+    state = {"current": 0, "peak": 0}
+
+    def work() -> None:
+        with limiter.permit():
+            with lock:
+                state["current"] += 1
+                state["peak"] = max(state["peak"], state["current"])
+            time.sleep(0.02)
+            with lock:
+                state["current"] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return state["peak"]
+
+
+def test_is_overload_walks_the_exception_chain():
+    assert _is_overload(TimeoutError())
+    assert _is_overload(_QuotaError())
+    try:
+        try:
+            raise _QuotaError()
+        except _QuotaError as exc:
+            raise RuntimeError("wrapped") from exc
+    except RuntimeError as wrapped:
+        assert _is_overload(wrapped)
+    assert not _is_overload(ValueError())
+    assert not _is_overload(None)
+
+
+def test_threads_never_exceed_the_limit():
+    limiter = AdaptiveRateLimiter(max_concurrency=2)
+    assert _peak_concurrency(limiter, workers=8) == 2
+    assert limiter._in_flight == 0
+
+
+def test_async_permits_never_exceed_the_limit():
+    limiter = AdaptiveRateLimiter(max_concurrency=2)
+    state = {"current": 0, "peak": 0}
+
+    async def work() -> None:
+        async with limiter.permit():
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.02)
+            state["current"] -= 1
+
+    async def main() -> None:
+        await asyncio.gather(*(work() for _ in range(8)))
+
+    asyncio.run(main())
+    assert state["peak"] == 2
+    assert limiter._in_flight == 0
+
+
+def test_overload_shrinks_the_limit():
+    limiter = AdaptiveRateLimiter(max_concurrency=8, min_concurrency=2, decrease=0.5)
+    for expected in (4, 2, 2):
+        with pytest.raises(_QuotaError):
+            with limiter.permit():
+                raise _QuotaError()
+        assert limiter.limit == expected
+
+
+def test_healthy_windows_grow_the_limit_up_to_the_maximum():
+    limiter = AdaptiveRateLimiter(max_concurrency=4, increase=1.0)
+    limiter._limit = 1.0
+    for _ in range(20):
+        with limiter.permit():
+            pass
+    assert limiter.limit == 4
+
+
+def test_slow_windows_do_not_grow_the_limit():
+    limiter = AdaptiveRateLimiter(max_concurrency=4, target_latency=0.0, increase=1.0)
+    limiter._limit = 1.0
+    for _ in range(3):
+        with limiter.permit():
+            time.sleep(0.001)
+    assert limiter.limit == 1
+
+
+def test_other_errors_leave_the_limit_alone():
+    limiter = AdaptiveRateLimiter(max_concurrency=4)
+    with pytest.raises(ValueError):
+        with limiter.permit():
+            raise ValueError()
+    assert limiter.limit == 4
+    assert limiter._in_flight == 0
+
+
+def test_rate_window_blocks_once_full():
+    limiter = AdaptiveRateLimiter(max_concurrency=8, requests_per_minute=2)
+    for _ in range(2):
+        with limiter.permit():
+            pass
+    assert limiter._acquire(blocking=False) is None
+    # Starts older than a minute leave the window
+    limiter._starts = type(limiter._starts)(start - 61 for start in limiter._starts)
+    assert limiter._acquire(blocking=False) is not None
+
+
+def test_cancelled_async_wait_returns_its_permit():
+    limiter = AdaptiveRateLimiter(max_concurrency=1)
+
+    async def main() -> None:
+        holder = limiter.permit()
+        await holder.__aenter__()
+
+        async def wait() -> None:
+            async with limiter.permit():
+                pass
+
+        waiter = asyncio.ensure_future(wait())
+        await asyncio.sleep(0.02)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await holder.__aexit__(None, None, None)
+
+        # The abandoned thread gets the permit, then hands it back
+        async def acquire_again() -> None:
+            async with limiter.permit():
+                pass
+
+        await asyncio.wait_for(acquire_again(), timeout=2)
+
+    asyncio.run(main())
+    assert limiter._in_flight == 0
+
+
+def test_salary_agent_model_takes_a_permit_per_call(monkeypatch):
+    pytest.importorskip("deepagents")
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    from src.services import deep_agent_salary
+    from src.services.rate_limiter import gemini_limiter
+
+    in_flight = []
+
+    def generate(self, *args, **kwargs):
+        in_flight.append(gemini_limiter._in_flight)
+        return "result"
+
+    async def agenerate(self, *args, **kwargs):
+        in_flight.append(gemini_limiter._in_flight)
+        return "result"
+
+    monkeypatch.setattr(ChatGoogleGenerativeAI, "_generate", generate)
+    monkeypatch.setattr(ChatGoogleGenerativeAI, "_agenerate", agenerate)
+    model = deep_agent_salary._RateLimitedChatModel(model="gemini-2.0-flash", api_key="test")
+
+    assert model._generate([]) == "result"
+    assert asyncio.run(model._agenerate([])) == "result"
+    assert in_flight == [1, 1]
+    assert gemini_limiter._in_flight == 0
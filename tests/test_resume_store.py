@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from src.models.resume import Resume
+from src.storage import resume_store
+from src.storage.resume_store import (
+    JD_SKETCH_SIZE,
+    _jd_sketch,
+    _patching_view,
+    _sketch_similarity,
+    get_cached_ats_score,
+    hash_job_description,
+    load_parsed_resume,
+    load_parsed_resumes,
+    load_resume_body,
+    save_ats_score,
+    save_parsed_resume,
+    save_salary_insights,
+    save_upskilling_report,
+)
+from src.storage.sqlite_store import get_connection
+
+
+JOB_DESCRIPTION = " ".join(f"requirement{i}" for i in range(200))
+SCORE = {"overall_score": 80, "section_scores": {}}
+
+
+@pytest.fixture
+def resume_id(db):
+    return save_parsed_resume(Resume(full_name="Ada", skills=["Python"]))
+
+
+def test_missing_resume_raises(db):
+    with pytest.raises(FileNotFoundError):
+        load_parsed_resume("missing")
+    with pytest.raises(FileNotFoundError):
+        load_resume_body("missing")
+
+
+def test_view_merges_scores_and_insights(resume_id):
+    # Cached before the writes; each write must show up in it
+    assert load_parsed_resume(resume_id)["full_name"] == "Ada"
+    save_ats_score(resume_id, JOB_DESCRIPTION, SCORE)
+    save_salary_insights(resume_id, {"median": 1}, "Engineer", "Berlin")
+    save_upskilling_report(resume_id, '{"gaps": []}', "Lead")
+
+    view = load_parsed_resume(resume_id)
+    assert view["full_name"] == "Ada"
+    assert view["ats_scores"][hash_job_description(JOB_DESCRIPTION)]["score"] == SCORE
+    assert [entry["data"] for entry in view["salary_insights"]] == [{"median": 1}]
+    assert [entry["data"] for entry in view["upskilling_reports"]] == [{"gaps": []}]
+
+
+def test_patched_view_matches_a_rebuilt_view(resume_id):
+    load_parsed_resume(resume_id)
+    save_salary_insights(resume_id, {"median": 1}, "Engineer", "Berlin")
+    save_salary_insights(resume_id, {"median": 2}, "Engineer", "Berlin")
+    save_ats_score(resume_id, JOB_DESCRIPTION, SCORE)
+    patched = load_parsed_resume(resume_id)
+
+    resume_store._VIEW_CACHE.clear()
+    assert load_parsed_resume(resume_id) == patched
+    assert len(patched["salary_insights"]) == 2
+
+
+def test_body_never_includes_insights(resume_id):
+    save_salary_insights(resume_id, {"median": 1}, "Engineer", "Berlin")
+    body = load_resume_body(resume_id)
+    assert "salary_insights" not in body
+    assert body["full_name"] == "Ada"
+
+
+def test_view_rebuilt_during_a_write_is_not_patched_twice(resume_id):
+    load_parsed_resume(resume_id)
+    entry = '{"n": 1}'
+    with _patching_view(resume_id, "salary_insights", lambda entries: [*(entries or []), entry]):
+        get_connection().execute(
+            "INSERT INTO salary_insights (resume_id, entry) VALUES (?, ?)", (resume_id, entry)
+        )
+        # A reader misses the view after the commit and rebuilds it from the database
+        resume_store._VIEW_CACHE.pop(resume_id)
+        assert len(load_parsed_resume(resume_id)["salary_insights"]) == 1
+
+    assert len(load_parsed_resume(resume_id)["salary_insights"]) == 1
+
+
+def test_view_read_before_a_write_is_not_cached_after_it(resume_id):
+    with resume_store._RESUME_CACHE_LOCK:
+        generation = resume_store._view_generation
+    stale = dict(load_resume_body(resume_id))
+    resume_store._VIEW_CACHE.clear()
+
+    save_salary_insights(resume_id, {"median": 1}, "Engineer", "Berlin")
+    resume_store._view_put(resume_id, stale, generation)
+
+    assert len(load_parsed_resume(resume_id)["salary_insights"]) == 1
+
+
+def test_load_parsed_resumes_skips_missing_ids(resume_id):
+    save_upskilling_report(resume_id, {"gaps": []}, "Lead")
+    other = save_parsed_resume(Resume(full_name="Grace"))
+    resume_store._VIEW_CACHE.clear()
+
+    views = load_parsed_resumes([other, "missing", resume_id])
+    assert list(views) == [other, resume_id]
+    assert views[resume_id] == load_parsed_resume(resume_id)
+
+
+def test_exact_ats_score_ignores_formatting(resume_id):
+    save_ats_score(resume_id, JOB_DESCRIPTION, SCORE, schema_version=1)
+    reformatted = "  " + JOB_DESCRIPTION.upper().replace(" ", "\n")
+    for cached_view in (True, False):
+        if not cached_view:
+            resume_store._VIEW_CACHE.clear()
+        entry = get_cached_ats_score(resume_id, reformatted)
+        assert entry["score"] == SCORE
+        assert entry["schema_version"] == 1
+        assert "near_duplicate" not in entry
+
+
+def test_near_duplicates_are_opt_in_and_flagged(resume_id):
+    save_ats_score(resume_id, JOB_DESCRIPTION, SCORE)
+    edited = JOB_DESCRIPTION + " plus one more line"
+
+    assert get_cached_ats_score(resume_id, edited) is None
+    entry = get_cached_ats_score(resume_id, edited, near_duplicates=True)
+    assert entry["score"] == SCORE
+    assert entry["near_duplicate"]["job_description_hash"] == hash_job_description(JOB_DESCRIPTION)
+    assert entry["near_duplicate"]["similarity"] >= resume_store.JD_SIMILARITY_THRESHOLD
+
+    unrelated = " ".join(f"other{i}" for i in range(200))
+    assert get_cached_ats_score(resume_id, unrelated, near_duplicates=True) is None
+
+
+def test_sketch_is_sorted_and_bounded():
+    sketch = _jd_sketch(JOB_DESCRIPTION)
+    assert isinstance(sketch, array)
+    assert len(sketch) == JD_SKETCH_SIZE
+    assert list(sketch) == sorted(sketch)
+    assert len(_jd_sketch("three word text")) == 1
+    assert len(_jd_sketch("")) == 1
+
+
+def test_sketch_similarity_estimates_jaccard():
+    assert _sketch_similarity(_jd_sketch(JOB_DESCRIPTION), _jd_sketch(JOB_DESCRIPTION)) == 1.0
+    # Case and whitespace do not change the shingles
+    assert _sketch_similarity(
+        _jd_sketch(JOB_DESCRIPTION), _jd_sketch(JOB_DESCRIPTION.upper().replace(" ", "  "))
+    ) == 1.0
+
+    words = JOB_DESCRIPTION.split()
+    half = " ".join(words[:100] + [f"other{i}" for i in range(100)])
+    # 98 of the 198 shingles of each text are shared: Jaccard 98 / 298
+    estimate = _sketch_similarity(_jd_sketch(JOB_DESCRIPTION), _jd_sketch(half))
+    assert abs(estimate - 98 / 298) < 0.15
+
+    disjoint = " ".join(f"other{i}" for i in range(200))
+    assert _sketch_similarity(_jd_sketch(JOB_DESCRIPTION), _jd_sketch(disjoint)) == 0.0
+    assert _sketch_similarity(array("Q"), array("Q")) == 0.0
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from array import array
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, Sequence
+
+from src.services import gemini_client, semantic_cache
+from src.services.semantic_cache import SemanticCache, _normalize
+from src.storage.sqlite_store import get_connection
+
+
+class _FakeEmbeddingCache(SemanticCache):
+    """Semantic cache with fixed embeddings instead of Gemini calls."""
+
+    def __init__(self, vectors: Dict[str, Sequence[float]], **kwargs) -> None:
+        super().__init__(embedding_model="fake", **kwargs)
+        self.vectors = vectors
+        self.calls = []
+
+    def _request_embedding(self, text: str) -> array:
+        self.calls.append(text)
+        return _normalize(self.vectors[text])
+
+
+def _cache(**kwargs) -> _FakeEmbeddingCache:
+    vectors = {
+        "python engineer": [1.0, 0.0, 0.0],
+        "python developer": [0.98, 0.2, 0.0],
+        "chef": [0.0, 0.0, 1.0],
+    }
+    return _FakeEmbeddingCache(vectors, threshold=0.9, **kwargs)
+
+
+def test_normalize_returns_unit_vectors():
+    vector = _normalize([3.0, 4.0])
+    assert abs(sum(v * v for v in vector) - 1.0) < 1e-6
+    assert list(_normalize([0.0, 0.0])) == [0.0, 0.0]
+
+
+def test_similar_text_hits(db):
+    cache = _cache()
+    cache.store("Report", "python engineer", "US|5", "cached")
+    hit = cache.lookup("Report", "python developer", "US|5")
+    assert hit.response == "cached"
+    assert 0.9 <= hit.similarity <= 1.0
+    assert cache.lookup("Report", "chef", "US|5") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_guard_and_namespace_must_match(db):
+    cache = _cache()
+    cache.store("Report", "python engineer", "US|5", "cached")
+    assert cache.lookup("Report", "python engineer", "UK|5") is None
+    assert cache.lookup("Other", "python engineer", "US|5") is None
+
+
+def test_lookup_without_candidates_does_not_embed(db):
+    cache = _cache()
+    assert cache.lookup("Report", "python engineer", "US|5") is None
+    assert cache.calls == []
+
+
+def test_miss_then_store_embeds_once(db):
+    cache = _cache()
+    cache.store("Report", "chef", "US|5", "other")
+    assert cache.lookup("Report", "python engineer", "US|5") is None
+    cache.store("Report", "python engineer", "US|5", "cached")
+    assert cache.calls.count("python engineer") == 1
+
+
+def test_expired_entries_are_ignored(db):
+    cache = _cache(ttl_seconds=60)
+    cache.store("Report", "python engineer", "US|5", "cached")
+    get_connection().execute("UPDATE semantic_cache SET created_at = created_at - 120")
+    assert cache.lookup("Report", "python engineer", "US|5") is None
+
+
+def test_embedding_failure_is_a_miss_and_skips_store(db):
+    cache = _FakeEmbeddingCache({}, threshold=0.9)
+    cache.store("Report", "unknown", "US|5", "cached")
+    assert get_connection().execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0] == 0
+    _cache().store("Report", "python engineer", "US|5", "cached")
+    assert cache.lookup("Report", "unknown", "US|5") is None
+
+
+def _rows():
+    return get_connection().execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0]
+
+
+def test_storing_the_same_text_replaces_its_entry(db):
+    cache = _cache()
+    cache.store("Report", "python engineer", "US|5", "old")
+    cache.store("Report", "python engineer", "US|5", "new")
+    assert _rows() == 1
+    assert cache.lookup("Report", "python engineer", "US|5").response == "new"
+
+
+def test_each_guard_keeps_its_newest_entries(db):
+    cache = _cache(max_entries_per_guard=2)
+    for text in ("chef", "python developer", "python engineer"):
+        cache.store("Report", text, "US|5", text)
+    cache.store("Report", "chef", "UK|5", "chef")
+    texts = {row[0] for row in get_connection().execute(
+        "SELECT response FROM semantic_cache WHERE guard = 'US|5'"
+    )}
+    assert texts == {"python developer", "python engineer"}
+    assert _rows() == 3
+
+
+def test_store_deletes_expired_entries(db):
+    cache = _cache(ttl_seconds=60)
+    cache.store("Report", "chef", "UK|5", "stale")
+    get_connection().execute("UPDATE semantic_cache SET created_at = created_at - 120")
+    cache._last_prune = 0.0
+    cache.store("Report", "python engineer", "US|5", "cached")
+    assert _rows() == 1
+
+
+def test_embeddings_use_the_shared_client_under_a_permit(db, monkeypatch):
+    events = []
+
+    def embed_content(model, contents):
+        events.append("embed")
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[3.0, 4.0])])
+
+    @contextmanager
+    def permit():
+        events.append("acquire")
+        yield
+        events.append("release")
+
+    client = SimpleNamespace(models=SimpleNamespace(embed_content=embed_content))
+    monkeypatch.setenv("GEMINI_API_KEY", "key")
+    monkeypatch.setattr(gemini_client, "_genai_client", lambda api_key: client)
+    monkeypatch.setattr(semantic_cache.gemini_limiter, "permit", permit)
+    vector = SemanticCache(embedding_model="fake", threshold=0.9)._request_embedding("text")
+    assert events == ["acquire", "embed", "release"]
+    assert [round(v, 3) for v in vector] == [0.6, 0.8]
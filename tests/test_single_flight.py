@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flights: SingleFlight[int] = SingleFlight()
+    runs = []
+
+    async def work() -> int:
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main():
+        return await asyncio.gather(*(flights.run("key", work) for _ in range(5)))
+
+    assert asyncio.run(main()) == [42] * 5
+    assert len(runs) == 1
+    assert flights._inflight == {}
+
+
+def test_distinct_keys_run_separately():
+    flights: SingleFlight[str] = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(
+            flights.run("a", lambda: asyncio.sleep(0, result="a")),
+            flights.run("b", lambda: asyncio.sleep(0, result="b")),
+        )
+
+    assert asyncio.run(main()) == ["a", "b"]
+
+
+def test_key_is_forgotten_after_completion():
+    flights: SingleFlight[int] = SingleFlight()
+    runs = []
+
+    async def work() -> int:
+        runs.append(1)
+        return len(runs)
+
+    async def main():
+        return [await flights.run("key", work), await flights.run("key", work)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_errors_reach_every_caller():
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def work() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            flights.run("key", work), flights.run("key", work), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert results[0] is results[1]
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def work() -> int:
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def main():
+        first = asyncio.ensure_future(flights.run("key", work))
+        second = asyncio.ensure_future(flights.run("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 7
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from src.storage import sqlite_store
+from src.storage.sqlite_store import get_connection, transaction
+
+
+def _count(table: str) -> int:
+    return get_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_connection_is_reused_per_thread(db):
+    assert get_connection() is get_connection()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(get_connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not get_connection()
+
+
+def test_changed_db_path_gets_a_new_connection(db, tmp_path, monkeypatch):
+    first = get_connection()
+    monkeypatch.setattr(sqlite_store, "DB_PATH", tmp_path / "other.db")
+    assert get_connection() is not first
+
+
+def test_schema_is_created(db):
+    tables = {
+        name for (name,) in get_connection().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    assert {"resumes", "ats_scores", "ats_sketches", "llm_cache", "semantic_cache"} <= tables
+
+
+def test_transaction_commits(db):
+    with transaction() as tx:
+        tx.execute("INSERT INTO resumes (id, data) VALUES ('a', '{}')")
+        tx.execute("INSERT INTO resumes (id, data) VALUES ('b', '{}')")
+    assert _count("resumes") == 2
+    assert not get_connection().in_transaction
+
+
+def test_transaction_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with transaction() as tx:
+            tx.execute("INSERT INTO resumes (id, data) VALUES ('a', '{}')")
+            raise RuntimeError("boom")
+    assert _count("resumes") == 0
+    assert not get_connection().in_transaction
+
+
+def test_transaction_is_visible_to_other_threads_only_after_commit(db):
+    seen = []
+
+    def _read() -> None:
+        seen.append(_count("resumes"))
+
+    with transaction() as tx:
+        tx.execute("INSERT INTO resumes (id, data) VALUES ('a', '{}')")
+        reader = threading.Thread(target=_read)
+        reader.start()
+        reader.join()
+    _read()
+    assert seen == [0, 1]